@@ -4,6 +4,10 @@ import type { WebSocketMessage } from "../types";
 const WS_URL = "ws://localhost:8000/ws";
 const API_URL = "http://localhost:8000/api";
 
+// JSON travels as UTF-8 binary frames in both directions
+const decoder = new TextDecoder();
+const encoder = new TextEncoder();
+
 export function useWebSocket(channelId: string | null) {
   const wsRef = useRef<WebSocket | null>(null);
   const [messages, setMessages] = useState<WebSocketMessage[]>([]);
@@ -42,6 +46,7 @@ export function useWebSocket(channelId: string | null) {
 
     // Connect WebSocket for real-time messages
     const ws = new WebSocket(`${WS_URL}/${channelId}`);
+    ws.binaryType = "arraybuffer";
     wsRef.current = ws;
 
     ws.onopen = () => setConnected(true);
@@ -50,7 +55,9 @@ export function useWebSocket(channelId: string | null) {
 
     ws.onmessage = (event) => {
       try {
-        const data: WebSocketMessage = JSON.parse(event.data);
+        const raw =
+          typeof event.data === "string" ? event.data : decoder.decode(event.data);
+        const data: WebSocketMessage = JSON.parse(raw);
         if (data.type === "message") {
           setMessages((prev) => [...prev, data]);
         }
@@ -70,7 +77,7 @@ export function useWebSocket(channelId: string | null) {
     (content: string, senderName = "Human") => {
       if (wsRef.current?.readyState === WebSocket.OPEN) {
         wsRef.current.send(
-          JSON.stringify({ content, sender_name: senderName })
+          encoder.encode(JSON.stringify({ content, sender_name: senderName }))
         );
       }
     },
@@ -1,14 +1,82 @@
 """Context builder for assembling agent prompts."""
 
 import base64
-import mimetypes
+import os
 import platform
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 from sotion.agent.memory import MemoryStore
 from sotion.agent.skills import SkillsLoader
 
+try:
+    # SIMD-accelerated encoder; same API as the stdlib
+    from pybase64 import b64encode as _b64encode
+except ImportError:
+    _b64encode = base64.b64encode
+
+# Host OS/arch never changes during the process lifetime
+_SYSTEM = platform.system()
+_RUNTIME = f"{'macOS' if _SYSTEM == 'Darwin' else _SYSTEM} {platform.machine()}"
+
+# Bootstrap file contents keyed by path -> (st_mtime_ns, st_size, content).
+# These files are effectively immutable at runtime, so a stat per file is
+# enough to decide whether a re-read is needed.
+_BOOTSTRAP_CACHE: dict[Path, tuple[int, int, str]] = {}
+
+# Bumped by invalidate_bootstrap_cache so every builder's joined cache misses
+_BOOTSTRAP_GENERATION = 0
+
+# Image types accepted as attachments, by lowercase file extension
+_IMG_MIME = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+    ".bmp": "image/bmp",
+}
+
+# Read size for streaming image encoding; a multiple of 3 so no chunk
+# emits base64 padding mid-stream.
+_B64_CHUNK = 3 * 57 * 1024
+
+
+def _encode_data_url(path: Path, mime: str) -> str:
+    """Base64-encode a file into a data URL, streaming it into a pre-sized buffer."""
+    prefix = f"data:{mime};base64,".encode("ascii")
+    with path.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        buf = bytearray(len(prefix) + (size + 2) // 3 * 4)
+        buf[:len(prefix)] = prefix
+        pos = len(prefix)
+        while chunk := f.read(_B64_CHUNK):
+            encoded = _b64encode(chunk)
+            buf[pos:pos + len(encoded)] = encoded
+            pos += len(encoded)
+    # Trim in case the file shrank between fstat and read
+    del buf[pos:]
+    return buf.decode("ascii")
+
+
+def _read_text(path: Path) -> str | None:
+    """Read a UTF-8 text file as raw bytes and decode once; None if it vanished."""
+    try:
+        with open(path, "rb", buffering=0) as f:
+            return f.read().decode("utf-8")
+    except (FileNotFoundError, IsADirectoryError):
+        return None
+
+
+@lru_cache(maxsize=64)
+def _encode_image(path: str, mtime_ns: int, size: int, mime: str) -> str:
+    """Data URL for an image, memoized on (path, mtime_ns, size) so re-sends skip I/O."""
+    return _encode_data_url(Path(path), mime)
+
 
 class ContextBuilder:
     """
@@ -22,6 +90,7 @@ class ContextBuilder:
 
     def __init__(self, workspace: Path):
         self.workspace = workspace
+        self._workspace_resolved = str(workspace.expanduser().resolve())
         self.memory = MemoryStore(workspace)
         self.skills = SkillsLoader(workspace)
 
@@ -31,6 +100,16 @@ class ContextBuilder:
         self.role_prompt: str | None = None
         self.team_roster: list[dict[str, str]] | None = None
         self.economy_status: dict[str, Any] | None = None
+        # Pre-rendered identity pieces (refreshed by set_agent_identity)
+        self._role_section = ""
+        self._economy_str = ""
+
+        # (generation + per-file (path, mtime_ns, size), joined bootstrap section)
+        self._bootstrap_joined_cache: tuple[tuple[Any, ...], str] | None = None
+        # (fingerprint, stable prompt, active skills section)
+        self._prompt_cache: tuple[Any, str, str] | None = None
+        # (memory fingerprint, memory section)
+        self._memory_cache: tuple[Any, str] | None = None
 
     def set_agent_identity(
         self,
@@ -46,9 +125,69 @@ class ContextBuilder:
         self.role_prompt = role_prompt
         self.team_roster = team_roster
         self.economy_status = economy_status
+        self._role_section = self._format_role_section()
+        self._economy_str = self._format_economy()
 
     def build_system_prompt(self, skill_names: list[str] | None = None) -> str:
-        """Build the system prompt from all context sources."""
+        """Build the full system prompt (stable prefix + volatile context)."""
+        cache = self._get_prompt_cache()
+        stable = self.build_stable_system_prompt(cache)
+        return f"{stable}\n\n---\n\n{self.build_volatile_context(prompt_cache=cache)}"
+
+    def build_stable_system_prompt(self, prompt_cache: tuple[Any, str, str] | None = None) -> str:
+        """
+        Build the part of the system prompt that stays identical across turns.
+
+        Identity, bootstrap files and the skills summary only. Keeping this
+        prefix byte-stable lets providers reuse their prompt cache. Pass the
+        turn's `_get_prompt_cache()` result to skip re-checking the files.
+        """
+        return (prompt_cache or self._get_prompt_cache())[1]
+
+    def build_volatile_context(
+        self,
+        channel: str | None = None,
+        chat_id: str | None = None,
+        prompt_cache: tuple[Any, str, str] | None = None,
+    ) -> str:
+        """Build the per-turn context: time, memory, active skills, session."""
+        now = time.strftime("%Y-%m-%d %H:%M (%A)", time.localtime())
+        parts = [f"## Current Time\n{now}"]
+
+        memory = self._get_memory_section()
+        if memory:
+            parts.append(memory)
+
+        active_skills = (prompt_cache or self._get_prompt_cache())[2]
+        if active_skills:
+            parts.append(active_skills)
+
+        if channel and chat_id:
+            parts.append(f"## Current Session\nChannel: {channel}\nChat ID: {chat_id}")
+
+        return "\n\n---\n\n".join(parts)
+
+    def _get_prompt_cache(self) -> tuple[Any, str, str]:
+        """Return the cached (fingerprint, stable prompt, active skills), rebuilding if stale."""
+        key = self._prompt_fingerprint()
+        if self._prompt_cache is None or self._prompt_cache[0] != key:
+            self._prompt_cache = (key, self._render_stable_prompt(), self._render_active_skills())
+        return self._prompt_cache
+
+    def _prompt_fingerprint(self) -> tuple[Any, ...]:
+        """Key over every input of the stable prompt and active skills."""
+        multi_agent = bool(self.agent_name and self.role_prompt)
+        return (
+            self.workspace,
+            multi_agent,
+            self._role_section,
+            self._economy_str,
+            None if multi_agent else self._load_bootstrap_files(),
+            self.skills.fingerprint(),
+        )
+
+    def _render_stable_prompt(self) -> str:
+        """Assemble identity, bootstrap files and skills summary."""
         parts = []
 
         # Core identity (sotion or nanobot-style)
@@ -65,30 +204,40 @@ class ContextBuilder:
             if bootstrap:
                 parts.append(bootstrap)
 
-        # Memory context
-        memory = self.memory.get_memory_context()
-        if memory:
-            parts.append(f"# Memory\n\n{memory}")
+        skills_summary = self.skills.build_skills_summary()
+        if skills_summary:
+            parts.append(f"# Skills\n\n{skills_summary}")
 
-        # Skills
+        return "\n\n---\n\n".join(parts)
+
+    def _render_active_skills(self) -> str:
+        """Assemble the always-on skills section."""
         always_skills = self.skills.get_always_skills()
         if always_skills:
             always_content = self.skills.load_skills_for_context(always_skills)
             if always_content:
-                parts.append(f"# Active Skills\n\n{always_content}")
+                return f"# Active Skills\n\n{always_content}"
+        return ""
 
-        skills_summary = self.skills.build_skills_summary()
-        if skills_summary:
-            parts.append(f"# Skills\n\n{skills_summary}")
-
-        return "\n\n---\n\n".join(parts)
+    def _get_memory_section(self) -> str:
+        """Return the memory section, re-reading only when memory files change."""
+        key = self.memory.fingerprint()
+        if self._memory_cache is None or self._memory_cache[0] != key:
+            memory = self.memory.get_memory_context()
+            self._memory_cache = (key, f"# Memory\n\n{memory}" if memory else "")
+        return self._memory_cache[1]
 
     def _get_sotion_identity(self) -> str:
         """Get sotion multi-agent identity section."""
-        from datetime import datetime
-        now = datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
-        workspace_path = str(self.workspace.expanduser().resolve())
+        return f"""{self._role_section}
+
+## Workspace
+{self._workspace_resolved}
+
+{self._economy_str}"""
 
+    def _format_role_section(self) -> str:
+        """Render the role prompt with agent name and team roster filled in."""
         # Build team roster string
         roster_str = ""
         if self.team_roster:
@@ -100,66 +249,99 @@ class ContextBuilder:
                 )
             roster_str = "\n".join(roster_lines)
 
-        # Build economy status string
-        economy_str = ""
-        if self.economy_status:
-            economy_str = f"""## Your Status
-- Salary: {self.economy_status.get('salary_balance', 0)} credits
-- Performance: {self.economy_status.get('performance_score', 0.5):.2f}/1.0
-- Token budget remaining: {self.economy_status.get('token_budget', 100000):,}
-- Status: {self.economy_status.get('status', 'active')}
-
-High performers get bonuses. Score below 0.3 triggers a warning.
-Score below 0.15 means termination."""
-
         # Inject into role prompt
         role_section = self.role_prompt or ""
         if "{agent_name}" in role_section:
             role_section = role_section.replace("{agent_name}", self.agent_name or "Agent")
         if "{team_roster}" in role_section:
             role_section = role_section.replace("{team_roster}", roster_str)
+        return role_section
 
-        return f"""{role_section}
-
-## Current Time
-{now}
-
-## Workspace
-{workspace_path}
+    def _format_economy(self) -> str:
+        """Render the economy status section."""
+        if not self.economy_status:
+            return ""
+        return f"""## Your Status
+- Salary: {self.economy_status.get('salary_balance', 0)} credits
+- Performance: {self.economy_status.get('performance_score', 0.5):.2f}/1.0
+- Token budget remaining: {self.economy_status.get('token_budget', 100000):,}
+- Status: {self.economy_status.get('status', 'active')}
 
-{economy_str}"""
+High performers get bonuses. Score below 0.3 triggers a warning.
+Score below 0.15 means termination."""
 
     def _get_identity(self) -> str:
         """Get the default identity section (single-agent mode)."""
-        from datetime import datetime
-        now = datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
-        workspace_path = str(self.workspace.expanduser().resolve())
-        system = platform.system()
-        runtime = f"{'macOS' if system == 'Darwin' else system} {platform.machine()}"
+        workspace_path = self._workspace_resolved
 
         return f"""# Sotion Agent
 
 You are a helpful AI assistant with access to tools for file operations,
 shell commands, web search, and more.
 
-## Current Time
-{now}
-
 ## Runtime
-{runtime}
+{_RUNTIME}
 
 ## Workspace
 {workspace_path}"""
 
+    @classmethod
+    def invalidate_bootstrap_cache(cls) -> None:
+        """Drop cached bootstrap file contents (forces a re-read on next build)."""
+        global _BOOTSTRAP_GENERATION
+        _BOOTSTRAP_CACHE.clear()
+        _BOOTSTRAP_GENERATION += 1
+
     def _load_bootstrap_files(self) -> str:
-        """Load all bootstrap files from workspace."""
-        parts = []
+        """Load all bootstrap files from workspace (cached by mtime)."""
+        # One directory listing instead of an exists() per bootstrap file
+        try:
+            with os.scandir(self.workspace) as it:
+                entries = {e.name: e for e in it if e.name in self.BOOTSTRAP_FILES and e.is_file()}
+        except OSError:
+            entries = {}
+
+        found = []
         for filename in self.BOOTSTRAP_FILES:
-            file_path = self.workspace / filename
-            if file_path.exists():
-                content = file_path.read_text(encoding="utf-8")
-                parts.append(f"## {filename}\n\n{content}")
-        return "\n\n".join(parts) if parts else ""
+            entry = entries.get(filename)
+            if entry is None:
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            found.append((filename, self.workspace / filename, st.st_mtime_ns, st.st_size))
+
+        # Unchanged files: reuse the joined string, no allocation at all
+        key = (_BOOTSTRAP_GENERATION, *((path, mtime, size) for _, path, mtime, size in found))
+        if self._bootstrap_joined_cache is not None and self._bootstrap_joined_cache[0] == key:
+            return self._bootstrap_joined_cache[1]
+
+        # Read every stale file concurrently so a slow filesystem costs one round trip
+        stale = []
+        for _, file_path, mtime, size in found:
+            cached = _BOOTSTRAP_CACHE.get(file_path)
+            if not cached or cached[0] != mtime or cached[1] != size:
+                stale.append((file_path, mtime, size))
+        if len(stale) > 1:
+            with ThreadPoolExecutor(max_workers=len(stale)) as pool:
+                contents = list(pool.map(_read_text, [path for path, _, _ in stale]))
+        else:
+            contents = [_read_text(path) for path, _, _ in stale]
+        for (file_path, mtime, size), content in zip(stale, contents):
+            if content is None:
+                _BOOTSTRAP_CACHE.pop(file_path, None)
+            else:
+                _BOOTSTRAP_CACHE[file_path] = (mtime, size, content)
+
+        parts = [
+            f"## {filename}\n\n{_BOOTSTRAP_CACHE[file_path][2]}"
+            for filename, file_path, _, _ in found
+            if file_path in _BOOTSTRAP_CACHE
+        ]
+        joined = "\n\n".join(parts) if parts else ""
+        self._bootstrap_joined_cache = (key, joined)
+        return joined
 
     def build_messages(
         self,
@@ -170,38 +352,50 @@ shell commands, web search, and more.
         channel: str | None = None,
         chat_id: str | None = None,
     ) -> list[dict[str, Any]]:
-        """Build the complete message list for an LLM call."""
-        messages = []
+        """
+        Build the complete message list for an LLM call.
 
-        system_prompt = self.build_system_prompt(skill_names)
-        if channel and chat_id:
-            system_prompt += f"\n\n## Current Session\nChannel: {channel}\nChat ID: {chat_id}"
-        messages.append({"role": "system", "content": system_prompt})
+        The stable system prompt goes first so it forms a cacheable prefix;
+        per-turn context follows in a second system message.
+        """
+        # Size the list once instead of growing it through extend(history)
+        messages: list[dict[str, Any]] = [None] * (len(history) + 3)  # type: ignore[list-item]
 
-        messages.extend(history)
+        # One fingerprint check (skills + bootstrap stat) per turn, shared by both
+        cache = self._get_prompt_cache()
+        messages[0] = {"role": "system", "content": self.build_stable_system_prompt(cache)}
+        messages[1] = {
+            "role": "system",
+            "content": self.build_volatile_context(channel, chat_id, prompt_cache=cache),
+        }
+
+        messages[2:-1] = history
 
         user_content = self._build_user_content(current_message, media)
-        messages.append({"role": "user", "content": user_content})
+        messages[-1] = {"role": "user", "content": user_content}
 
         return messages
 
-    def _build_user_content(self, text: str, media: list[str] | None) -> str | list[dict[str, Any]]:
-        """Build user message content with optional base64-encoded images."""
-        if not media:
-            return text
-
+    def _build_user_content(self, text: str, media: list[str] | None) -> list[dict[str, Any]]:
+        """Build user message content parts: any base64-encoded images, then the text."""
         images = []
-        for path in media:
+        for path in media or ():
             p = Path(path)
-            mime, _ = mimetypes.guess_type(path)
-            if not p.is_file() or not mime or not mime.startswith("image/"):
+            mime = _IMG_MIME.get(p.suffix.lower())
+            if not mime:
+                continue
+            # One stat answers both "is it a regular file" and the cache key
+            try:
+                st = p.stat()
+                if not stat.S_ISREG(st.st_mode):
+                    continue
+                url = _encode_image(str(p), st.st_mtime_ns, st.st_size, mime)
+            except OSError:
                 continue
-            b64 = base64.b64encode(p.read_bytes()).decode()
-            images.append({"type": "image_url", "image_url": {"url": f"data:{mime};base64,{b64}"}})
+            images.append({"type": "image_url", "image_url": {"url": url}})
 
-        if not images:
-            return text
-        return images + [{"type": "text", "text": text}]
+        images.append({"type": "text", "text": text})
+        return images
 
     def add_tool_result(
         self,
@@ -187,6 +187,7 @@ class AgentLoop:
         # Agent loop
         iteration = 0
         final_content = None
+        llm_failed = False
 
         while iteration < self.max_iterations:
             iteration += 1
@@ -231,6 +232,7 @@ class AgentLoop:
                 # No tool calls, we're done
                 logger.debug(f"Iteration {iteration}: No tool calls, final response received")
                 final_content = response.content
+                llm_failed = response.finish_reason == "error"
                 break
 
         if final_content is None:
@@ -246,11 +248,14 @@ class AgentLoop:
         session.add_message("assistant", final_content)
         self.sessions.save(session)
         
+        metadata = msg.metadata or {}  # Pass through for channel-specific needs (e.g. Slack thread_ts)
+        if llm_failed:
+            metadata = {**metadata, "llm_error": True}
         return OutboundMessage(
             channel=msg.channel,
             chat_id=msg.chat_id,
             content=final_content,
-            metadata=msg.metadata or {},  # Pass through for channel-specific needs (e.g. Slack thread_ts)
+            metadata=metadata,
         )
     
     async def _process_system_message(self, msg: InboundMessage) -> OutboundMessage | None:
@@ -358,6 +363,7 @@ class AgentLoop:
         session_key: str = "cli:direct",
         channel: str = "cli",
         chat_id: str = "direct",
+        raise_on_error: bool = False,
     ) -> str:
         """
         Process a message directly (for CLI or cron usage).
@@ -367,6 +373,8 @@ class AgentLoop:
             session_key: Session identifier.
             channel: Source channel (for context).
             chat_id: Source chat ID (for context).
+            raise_on_error: Raise RuntimeError instead of returning the
+                error text when the LLM call itself failed.
         
         Returns:
             The agent's response.
@@ -379,4 +387,6 @@ class AgentLoop:
         )
         
         response = await self._process_message(msg)
+        if raise_on_error and response and response.metadata.get("llm_error"):
+            raise RuntimeError(response.content)
         return response.content if response else ""
@@ -1,7 +1,7 @@
 """Memory system for persistent agent memory."""
 
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from sotion.utils.helpers import ensure_dir, today_date
 
@@ -63,8 +63,6 @@ class MemoryStore:
         Returns:
             Combined memory content.
         """
-        from datetime import timedelta
-        
         memories = []
         today = datetime.now().date()
         
@@ -87,6 +85,23 @@ class MemoryStore:
         files = list(self.memory_dir.glob("????-??-??.md"))
         return sorted(files, reverse=True)
     
+    def fingerprint(self) -> tuple[tuple[str, int, int] | None, ...]:
+        """
+        Get a cheap change-detection key for the memory context.
+
+        Returns:
+            (path, mtime_ns, size) for MEMORY.md and today's notes (None if missing).
+        """
+        key = []
+        for file_path in (self.memory_file, self.get_today_file()):
+            try:
+                st = file_path.stat()
+            except OSError:
+                key.append(None)
+                continue
+            key.append((str(file_path), st.st_mtime_ns, st.st_size))
+        return tuple(key)
+    
     def get_memory_context(self) -> str:
         """
         Get memory context for the agent.
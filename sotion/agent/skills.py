@@ -56,6 +56,31 @@ class SkillsLoader:
             return [s for s in skills if self._check_requirements(self._get_skill_meta(s["name"]))]
         return skills
     
+    def fingerprint(self) -> tuple[tuple[str, int, int], ...]:
+        """
+        Get a cheap change-detection key for the skills directories.
+        
+        Returns:
+            Sorted (path, mtime_ns, size) of every SKILL.md found.
+        """
+        entries = []
+        for root in (self.workspace_skills, self.builtin_skills):
+            if not root:
+                continue
+            try:
+                with os.scandir(root) as it:
+                    names = [e.name for e in it if e.is_dir()]
+            except OSError:
+                continue
+            for name in names:
+                skill_file = root / name / "SKILL.md"
+                try:
+                    st = skill_file.stat()
+                except OSError:
+                    continue
+                entries.append((str(skill_file), st.st_mtime_ns, st.st_size))
+        return tuple(sorted(entries))
+    
     def load_skill(self, name: str) -> str | None:
         """
         Load a skill by name.
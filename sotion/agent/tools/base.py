@@ -91,12 +91,15 @@ class Tool(ABC):
         return errors
     
     def to_schema(self) -> dict[str, Any]:
-        """Convert tool to OpenAI function schema format."""
-        return {
-            "type": "function",
-            "function": {
-                "name": self.name,
-                "description": self.description,
-                "parameters": self.parameters,
+        """Convert tool to OpenAI function schema format (built once per instance)."""
+        schema = self.__dict__.get("_cached_schema")
+        if schema is None:
+            schema = self._cached_schema = {
+                "type": "function",
+                "function": {
+                    "name": self.name,
+                    "description": self.description,
+                    "parameters": self.parameters,
+                }
             }
-        }
+        return schema
@@ -0,0 +1,136 @@
+"""Response cache: reuse an agent's recent reply to an equivalent message."""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from loguru import logger
+
+from sotion.bus.events import InboundMessage, OutboundMessage
+
+try:
+    import numpy as np
+    from fastembed import TextEmbedding
+except ImportError:  # install the `cache` extra for semantic matching
+    np = None
+    TextEmbedding = None
+
+
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Words that suggest the agent will act (tools, docs, tasks) rather than just
+# answer; replaying a cached reply would silently skip the action
+_SIDE_EFFECT_HINTS = (
+    "create", "write", "edit", "update", "delete", "remove", "run", "exec",
+    "task", "doc", "log", "schedule", "remind", "send", "fix", "build",
+)
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+@dataclass
+class _Entry:
+    key: str
+    embedding: Any
+    response: OutboundMessage
+    created_at: float = field(default_factory=time.monotonic)
+    hits: int = 0
+
+
+class ResponseCache:
+    """
+    Per (channel, agent) cache of recent replies.
+
+    Messages match when their normalized text is identical or, with fastembed
+    installed, when their embeddings' cosine similarity reaches `threshold`.
+    Entries expire after `ttl` seconds; when a bucket is full the least
+    frequently hit (then oldest) entry is evicted.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        threshold: float = 0.92,
+        max_entries: int = 64,
+        embedding_model: str = DEFAULT_EMBEDDING_MODEL,
+    ):
+        self.ttl = ttl
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._buckets: dict[tuple[str, str], list[_Entry]] = {}
+        self._embedder = None
+        if TextEmbedding is not None:
+            try:
+                self._embedder = TextEmbedding(embedding_model)
+            except Exception as e:
+                logger.warning(f"Semantic response cache disabled, exact match only: {e}")
+
+    @staticmethod
+    def cacheable(message: InboundMessage) -> bool:
+        """Only plain chat without action words is safe to answer from cache."""
+        if message.message_type != "chat" or message.media:
+            return False
+        text = message.content.lower()
+        return not any(hint in text for hint in _SIDE_EFFECT_HINTS)
+
+    async def _embed(self, text: str) -> Any:
+        if self._embedder is None:
+            return None
+        # Model inference is CPU-bound; keep it off the event loop
+        vectors = await asyncio.to_thread(lambda: list(self._embedder.embed([text])))
+        vec = vectors[0]
+        return vec / np.linalg.norm(vec)
+
+    def _live_entries(self, bucket_key: tuple[str, str]) -> list[_Entry]:
+        entries = self._buckets.get(bucket_key)
+        if not entries:
+            return []
+        cutoff = time.monotonic() - self.ttl
+        entries[:] = [e for e in entries if e.created_at >= cutoff]
+        return entries
+
+    async def lookup(
+        self, channel_id: str, agent_name: str, content: str
+    ) -> OutboundMessage | None:
+        """Return a cached reply for an equivalent message, if any."""
+        entries = self._live_entries((channel_id, agent_name))
+        if not entries:
+            return None
+
+        key = _normalize(content)
+        best, best_sim = None, 0.0
+        for entry in entries:
+            if entry.key == key:
+                best, best_sim = entry, 1.0
+                break
+        if best is None and self._embedder is not None:
+            query = await self._embed(key)
+            for entry in entries:
+                if entry.embedding is None:
+                    continue
+                sim = float(np.dot(query, entry.embedding))
+                if sim > best_sim:
+                    best, best_sim = entry, sim
+
+        if best is None or best_sim < self.threshold:
+            return None
+        best.hits += 1
+        logger.info(f"Response cache hit for {agent_name} (sim={best_sim:.2f})")
+        return best.response
+
+    async def store(
+        self, channel_id: str, agent_name: str, content: str, response: OutboundMessage
+    ) -> None:
+        """Remember an agent's reply to a message."""
+        key = _normalize(content)
+        entry = _Entry(key=key, embedding=await self._embed(key), response=response)
+        entries = self._live_entries((channel_id, agent_name))
+        if not entries:
+            entries = self._buckets[(channel_id, agent_name)] = []
+        if len(entries) >= self.max_entries:
+            victim = min(entries, key=lambda e: (e.hits, e.created_at))
+            entries.remove(victim)
+        entries.append(entry)
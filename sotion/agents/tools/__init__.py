@@ -1,5 +1,6 @@
 """Sotion-specific agent tools."""
 
+from sotion.agents.tools.context import current_channel_id
 from sotion.agents.tools.delegate import DelegateTool
 from sotion.agents.tools.documents import CreateDocTool, EditDocTool, QueryDocsTool
 from sotion.agents.tools.tasks import CreateTaskTool, CompleteTaskTool
@@ -13,4 +14,5 @@ __all__ = [
     "CreateTaskTool",
     "CompleteTaskTool",
     "LogUpdateTool",
+    "current_channel_id",
 ]
@@ -0,0 +1,8 @@
+"""Per-message context read by the Sotion tools."""
+
+from contextvars import ContextVar
+
+# Channel of the message an agent is currently handling. The orchestrator sets
+# it around each agent turn; every asyncio task has its own copy, so agents
+# answering in different channels concurrently never see each other's value.
+current_channel_id: ContextVar[str] = ContextVar("current_channel_id", default="")
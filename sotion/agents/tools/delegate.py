@@ -15,23 +15,14 @@ class DelegateTool(Tool):
     ):
         self._delegate_callback = delegate_callback
         self._available_agents = available_agents or []
-
-    @property
-    def name(self) -> str:
-        return "delegate"
-
-    @property
-    def description(self) -> str:
-        agents_str = ", ".join(self._available_agents) if self._available_agents else "any registered agent"
-        return (
+        self._agent_set = frozenset(self._available_agents)
+        self._agents_str = ", ".join(self._available_agents) if self._available_agents else "any registered agent"
+        self._description = (
             f"Delegate a task to another agent on the team. "
-            f"Available agents: {agents_str}. "
+            f"Available agents: {self._agents_str}. "
             f"Use this when a message should be handled by a specialist."
         )
-
-    @property
-    def parameters(self) -> dict[str, Any]:
-        return {
+        self._parameters_schema: dict[str, Any] = {
             "type": "object",
             "properties": {
                 "agent_name": {
@@ -46,14 +37,26 @@ class DelegateTool(Tool):
             "required": ["agent_name", "task"],
         }
 
+    @property
+    def name(self) -> str:
+        return "delegate"
+
+    @property
+    def description(self) -> str:
+        return self._description
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return self._parameters_schema
+
     async def execute(self, agent_name: str = "", task: str = "", **kwargs: Any) -> str:
         if not agent_name or not task:
             return "Error: agent_name and task are required"
 
-        if self._available_agents and agent_name not in self._available_agents:
+        if self._agent_set and agent_name not in self._agent_set:
             return (
                 f"Error: Agent '{agent_name}' not found. "
-                f"Available agents: {', '.join(self._available_agents)}"
+                f"Available agents: {self._agents_str}"
             )
 
         if self._delegate_callback:
@@ -3,6 +3,7 @@
 from typing import Any
 
 from sotion.agent.tools.base import Tool
+from sotion.agents.tools.context import current_channel_id
 from sotion.db.queries import DBQueries
 from sotion.db.models import Document
 
@@ -14,22 +15,7 @@ class CreateDocTool(Tool):
         self._db = db
         self._channel_id = channel_id
         self._agent_id = agent_id
-
-    def set_context(self, channel_id: str, agent_id: str) -> None:
-        self._channel_id = channel_id
-        self._agent_id = agent_id
-
-    @property
-    def name(self) -> str:
-        return "create_doc"
-
-    @property
-    def description(self) -> str:
-        return "Create a new document in the current channel. Returns the document ID."
-
-    @property
-    def parameters(self) -> dict[str, Any]:
-        return {
+        self._parameters_schema: dict[str, Any] = {
             "type": "object",
             "properties": {
                 "title": {"type": "string", "description": "Document title"},
@@ -43,14 +29,27 @@ class CreateDocTool(Tool):
             "required": ["title", "content"],
         }
 
+    @property
+    def name(self) -> str:
+        return "create_doc"
+
+    @property
+    def description(self) -> str:
+        return "Create a new document in the current channel. Returns the document ID."
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return self._parameters_schema
+
     async def execute(self, title: str = "", content: str = "", doc_type: str = "note", **kwargs: Any) -> str:
         if not self._db:
             return "Error: Database not configured"
-        if not self._channel_id:
+        channel_id = self._channel_id or current_channel_id.get()
+        if not channel_id:
             return "Error: No channel context set"
 
         doc = Document(
-            channel_id=self._channel_id,
+            channel_id=channel_id,
             title=title,
             content=content,
             doc_type=doc_type,
@@ -67,9 +66,14 @@ class EditDocTool(Tool):
     def __init__(self, db: DBQueries | None = None, agent_id: str = ""):
         self._db = db
         self._agent_id = agent_id
-
-    def set_context(self, agent_id: str) -> None:
-        self._agent_id = agent_id
+        self._parameters_schema: dict[str, Any] = {
+            "type": "object",
+            "properties": {
+                "document_id": {"type": "string", "description": "Document ID to edit"},
+                "content": {"type": "string", "description": "New document content (full replacement)"},
+            },
+            "required": ["document_id", "content"],
+        }
 
     @property
     def name(self) -> str:
@@ -81,14 +85,7 @@ class EditDocTool(Tool):
 
     @property
     def parameters(self) -> dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "document_id": {"type": "string", "description": "Document ID to edit"},
-                "content": {"type": "string", "description": "New document content (full replacement)"},
-            },
-            "required": ["document_id", "content"],
-        }
+        return self._parameters_schema
 
     async def execute(self, document_id: str = "", content: str = "", **kwargs: Any) -> str:
         if not self._db:
@@ -106,9 +103,16 @@ class QueryDocsTool(Tool):
     def __init__(self, db: DBQueries | None = None, channel_id: str = ""):
         self._db = db
         self._channel_id = channel_id
-
-    def set_context(self, channel_id: str) -> None:
-        self._channel_id = channel_id
+        self._parameters_schema: dict[str, Any] = {
+            "type": "object",
+            "properties": {
+                "doc_type": {
+                    "type": "string",
+                    "description": "Filter by doc type (optional)",
+                    "enum": ["project_plan", "task", "note", "learnings"],
+                },
+            },
+        }
 
     @property
     def name(self) -> str:
@@ -120,30 +124,24 @@ class QueryDocsTool(Tool):
 
     @property
     def parameters(self) -> dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "doc_type": {
-                    "type": "string",
-                    "description": "Filter by doc type (optional)",
-                    "enum": ["project_plan", "task", "note", "learnings"],
-                },
-            },
-        }
+        return self._parameters_schema
 
     async def execute(self, doc_type: str | None = None, **kwargs: Any) -> str:
         if not self._db:
             return "Error: Database not configured"
-        if not self._channel_id:
+        channel_id = self._channel_id or current_channel_id.get()
+        if not channel_id:
             return "Error: No channel context set"
 
-        docs = await self._db.list_channel_documents(self._channel_id, doc_type)
+        docs = await self._db.list_channel_documents(channel_id, doc_type)
         if not docs:
             return "No documents found."
 
-        lines = [f"Found {len(docs)} document(s):\n"]
-        for d in docs:
-            preview = d.content[:100] + "..." if len(d.content) > 100 else d.content
-            lines.append(f"- [{d.doc_type}] {d.title} (id: {d.id}, v{d.version})")
-            lines.append(f"  Preview: {preview}\n")
-        return "\n".join(lines)
+        return "\n".join([
+            f"Found {len(docs)} document(s):\n",
+            *(
+                f"- [{d.doc_type}] {d.title} (id: {d.id}, v{d.version})\n"
+                f"  Preview: {d.content[:100]}{'...' if len(d.content) > 100 else ''}\n"
+                for d in docs
+            ),
+        ])
@@ -3,6 +3,7 @@
 from typing import Any
 
 from sotion.agent.tools.base import Tool
+from sotion.agents.tools.context import current_channel_id
 from sotion.db.queries import DBQueries
 from sotion.db.models import AgentUpdate
 
@@ -14,10 +15,16 @@ class LogUpdateTool(Tool):
         self._db = db
         self._agent_id = agent_id
         self._channel_id = channel_id
-
-    def set_context(self, agent_id: str, channel_id: str) -> None:
-        self._agent_id = agent_id
-        self._channel_id = channel_id
+        self._parameters_schema: dict[str, Any] = {
+            "type": "object",
+            "properties": {
+                "summary": {
+                    "type": "string",
+                    "description": "A concise summary of what you did or accomplished",
+                },
+            },
+            "required": ["summary"],
+        }
 
     @property
     def name(self) -> str:
@@ -32,26 +39,18 @@ class LogUpdateTool(Tool):
 
     @property
     def parameters(self) -> dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "summary": {
-                    "type": "string",
-                    "description": "A concise summary of what you did or accomplished",
-                },
-            },
-            "required": ["summary"],
-        }
+        return self._parameters_schema
 
     async def execute(self, summary: str = "", **kwargs: Any) -> str:
         if not self._db:
             return "Error: Database not configured"
-        if not self._agent_id or not self._channel_id:
+        channel_id = self._channel_id or current_channel_id.get()
+        if not self._agent_id or not channel_id:
             return "Error: Agent/channel context not set"
 
         update = AgentUpdate(
             agent_id=self._agent_id,
-            channel_id=self._channel_id,
+            channel_id=channel_id,
             summary=summary,
         )
         await self._db.create_update(update)
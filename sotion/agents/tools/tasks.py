@@ -3,6 +3,7 @@
 from typing import Any
 
 from sotion.agent.tools.base import Tool
+from sotion.agents.tools.context import current_channel_id
 from sotion.db.queries import DBQueries
 from sotion.db.models import Task
 
@@ -13,21 +14,7 @@ class CreateTaskTool(Tool):
     def __init__(self, db: DBQueries | None = None, channel_id: str = ""):
         self._db = db
         self._channel_id = channel_id
-
-    def set_context(self, channel_id: str) -> None:
-        self._channel_id = channel_id
-
-    @property
-    def name(self) -> str:
-        return "create_task"
-
-    @property
-    def description(self) -> str:
-        return "Create a new task and optionally assign it to an agent."
-
-    @property
-    def parameters(self) -> dict[str, Any]:
-        return {
+        self._parameters_schema: dict[str, Any] = {
             "type": "object",
             "properties": {
                 "title": {"type": "string", "description": "Task title"},
@@ -46,6 +33,18 @@ class CreateTaskTool(Tool):
             "required": ["title"],
         }
 
+    @property
+    def name(self) -> str:
+        return "create_task"
+
+    @property
+    def description(self) -> str:
+        return "Create a new task and optionally assign it to an agent."
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return self._parameters_schema
+
     async def execute(
         self,
         title: str = "",
@@ -58,7 +57,7 @@ class CreateTaskTool(Tool):
             return "Error: Database not configured"
 
         task = Task(
-            channel_id=self._channel_id or None,
+            channel_id=self._channel_id or current_channel_id.get() or None,
             title=title,
             description=description,
             assigned_to=assigned_to,
@@ -74,18 +73,7 @@ class CompleteTaskTool(Tool):
 
     def __init__(self, db: DBQueries | None = None):
         self._db = db
-
-    @property
-    def name(self) -> str:
-        return "complete_task"
-
-    @property
-    def description(self) -> str:
-        return "Mark a task as completed, optionally with a quality score."
-
-    @property
-    def parameters(self) -> dict[str, Any]:
-        return {
+        self._parameters_schema: dict[str, Any] = {
             "type": "object",
             "properties": {
                 "task_id": {"type": "string", "description": "Task ID to complete"},
@@ -99,6 +87,18 @@ class CompleteTaskTool(Tool):
             "required": ["task_id"],
         }
 
+    @property
+    def name(self) -> str:
+        return "complete_task"
+
+    @property
+    def description(self) -> str:
+        return "Mark a task as completed, optionally with a quality score."
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return self._parameters_schema
+
     async def execute(
         self, task_id: str = "", quality_score: float | None = None, **kwargs: Any
     ) -> str:
@@ -1,20 +1,47 @@
 """REST API routes for sotion."""
 
+import asyncio
 from datetime import datetime
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Response
+from pydantic import BaseModel, TypeAdapter
 
 from sotion.db.client import get_supabase
 from sotion.db.queries import DBQueries
-from sotion.db.models import Channel, Agent, Message, ChannelMember, Document
+from sotion.db.models import Channel, Agent, Message, ChannelMember, Document, Task
 
 router = APIRouter()
 
 
-def _get_db() -> DBQueries:
-    return DBQueries(get_supabase())
+_db: DBQueries | None = None
+
+
+def get_db() -> DBQueries:
+    """FastAPI dependency returning the shared DBQueries instance."""
+    global _db
+    if _db is None:
+        _db = DBQueries(get_supabase())
+    return _db
+
+
+# Serializers for list endpoints: one pass in pydantic-core straight to
+# JSON bytes instead of per-row model_dump + re-encoding by FastAPI
+_CHANNELS = TypeAdapter(list[Channel])
+_MESSAGES = TypeAdapter(list[Message])
+_MEMBERS = TypeAdapter(list[ChannelMember])
+_AGENTS = TypeAdapter(list[Agent])
+_DOCUMENTS = TypeAdapter(list[Document])
+_TASKS = TypeAdapter(list[Task])
+
+
+def _json_list(adapter: TypeAdapter, items: list[Any]) -> Response:
+    return Response(content=adapter.dump_json(items), media_type="application/json")
+
+
+def _json(model: BaseModel) -> Response:
+    # Returning a Response skips FastAPI's jsonable_encoder pass entirely
+    return Response(content=model.model_dump_json(), media_type="application/json")
 
 
 # --- Request/Response models ---
@@ -65,54 +92,47 @@ class CompleteTaskRequest(BaseModel):
 # --- Channel endpoints ---
 
 @router.get("/channels")
-async def list_channels():
-    db = _get_db()
+async def list_channels(db: DBQueries = Depends(get_db)):
     channels = await db.list_channels()
-    return [c.model_dump(mode="json") for c in channels]
+    return _json_list(_CHANNELS, channels)
 
 
 @router.post("/channels")
-async def create_channel(req: CreateChannelRequest):
-    db = _get_db()
+async def create_channel(req: CreateChannelRequest, db: DBQueries = Depends(get_db)):
     channel = Channel(name=req.name, description=req.description, channel_type=req.channel_type)
     result = await db.create_channel(channel)
-    return result.model_dump(mode="json")
+    return _json(result)
 
 
 @router.get("/channels/{channel_id}")
-async def get_channel(channel_id: str):
-    db = _get_db()
+async def get_channel(channel_id: str, db: DBQueries = Depends(get_db)):
     channel = await db.get_channel(channel_id)
     if not channel:
         raise HTTPException(status_code=404, detail="Channel not found")
-    return channel.model_dump(mode="json")
+    return _json(channel)
 
 
 @router.get("/channels/{channel_id}/messages")
-async def get_channel_messages(channel_id: str, limit: int = 50):
-    db = _get_db()
+async def get_channel_messages(channel_id: str, limit: int = 50, db: DBQueries = Depends(get_db)):
     messages = await db.get_channel_messages(channel_id, limit=limit)
-    return [m.model_dump(mode="json") for m in messages]
+    return _json_list(_MESSAGES, messages)
 
 
 @router.get("/channels/{channel_id}/members")
-async def get_channel_members(channel_id: str):
-    db = _get_db()
+async def get_channel_members(channel_id: str, db: DBQueries = Depends(get_db)):
     members = await db.get_channel_members(channel_id)
-    return [m.model_dump(mode="json") for m in members]
+    return _json_list(_MEMBERS, members)
 
 
 @router.post("/channels/{channel_id}/members/{agent_id}")
-async def add_channel_member(channel_id: str, agent_id: str):
-    db = _get_db()
+async def add_channel_member(channel_id: str, agent_id: str, db: DBQueries = Depends(get_db)):
     member = ChannelMember(channel_id=channel_id, agent_id=agent_id)
     result = await db.add_member(member)
-    return result.model_dump(mode="json")
+    return _json(result)
 
 
 @router.post("/channels/{channel_id}/pause")
-async def pause_agents(channel_id: str, req: PauseRequest):
-    db = _get_db()
+async def pause_agents(channel_id: str, req: PauseRequest, db: DBQueries = Depends(get_db)):
     if req.except_agent_id:
         await db.pause_all_except(channel_id, req.except_agent_id)
         return {"status": "paused_all_except", "except_agent_id": req.except_agent_id}
@@ -122,9 +142,8 @@ async def pause_agents(channel_id: str, req: PauseRequest):
 
 
 @router.post("/channels/{channel_id}/unpause")
-async def unpause_agents(channel_id: str):
+async def unpause_agents(channel_id: str, db: DBQueries = Depends(get_db)):
     """Unpause all agents in a channel (exit 1:1 mode)."""
-    db = _get_db()
     await db.unpause_all(channel_id)
     return {"status": "success", "message": "All agents unpaused"}
 
@@ -132,14 +151,12 @@ async def unpause_agents(channel_id: str):
 # --- DM endpoints ---
 
 @router.post("/dms")
-async def create_dm(req: CreateDMRequest):
+async def create_dm(req: CreateDMRequest, db: DBQueries = Depends(get_db)):
     """Create or get existing DM conversation with an agent."""
-    db = _get_db()
-
     # Check if DM already exists with this agent
     existing = await db.find_dm_by_agent(req.agent_id)
     if existing:
-        return existing.model_dump(mode="json")
+        return _json(existing)
 
     # Get agent info for naming
     agent = await db.get_agent(req.agent_id)
@@ -164,26 +181,25 @@ async def create_dm(req: CreateDMRequest):
     )
     await db.add_member(member)
 
-    return result.model_dump(mode="json")
+    return _json(result)
 
 
 @router.get("/dms")
-async def list_dms():
+async def list_dms(db: DBQueries = Depends(get_db)):
     """List all DM conversations with agent info."""
-    db = _get_db()
     dms = await db.list_dms()
 
-    # Enrich with agent info
+    # Enrich with agent info, fetching every participant concurrently
+    dms = [dm for dm in dms if dm.dm_participant_agent_id]
+    agents = await asyncio.gather(*(db.get_agent(dm.dm_participant_agent_id) for dm in dms))
     enriched = []
-    for dm in dms:
-        if dm.dm_participant_agent_id:
-            agent = await db.get_agent(dm.dm_participant_agent_id)
-            enriched.append({
-                **dm.model_dump(mode="json"),
-                "agent_name": agent.name if agent else "Unknown",
-                "agent_role": agent.role if agent else None,
-                "agent_avatar_emoji": agent.avatar_emoji if agent else "🤖",
-            })
+    for dm, agent in zip(dms, agents):
+        enriched.append({
+            **dm.model_dump(mode="json"),
+            "agent_name": agent.name if agent else "Unknown",
+            "agent_role": agent.role if agent else None,
+            "agent_avatar_emoji": agent.avatar_emoji if agent else "🤖",
+        })
 
     return enriched
 
@@ -191,15 +207,13 @@ async def list_dms():
 # --- Agent endpoints ---
 
 @router.get("/agents")
-async def list_agents():
-    db = _get_db()
+async def list_agents(db: DBQueries = Depends(get_db)):
     agents = await db.list_agents()
-    return [a.model_dump(mode="json") for a in agents]
+    return _json_list(_AGENTS, agents)
 
 
 @router.post("/agents")
-async def create_agent(req: CreateAgentRequest):
-    db = _get_db()
+async def create_agent(req: CreateAgentRequest, db: DBQueries = Depends(get_db)):
     agent = Agent(
         name=req.name,
         role=req.role,
@@ -209,41 +223,36 @@ async def create_agent(req: CreateAgentRequest):
         config=req.config,
     )
     result = await db.create_agent(agent)
-    return result.model_dump(mode="json")
+    return _json(result)
 
 
 @router.get("/agents/{agent_id}")
-async def get_agent(agent_id: str):
-    db = _get_db()
+async def get_agent(agent_id: str, db: DBQueries = Depends(get_db)):
     agent = await db.get_agent(agent_id)
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
-    return agent.model_dump(mode="json")
+    return _json(agent)
 
 
 # --- Document endpoints ---
 
 @router.get("/channels/{channel_id}/documents")
-async def list_documents(channel_id: str, doc_type: str | None = None):
-    db = _get_db()
+async def list_documents(channel_id: str, doc_type: str | None = None, db: DBQueries = Depends(get_db)):
     docs = await db.list_channel_documents(channel_id, doc_type)
-    return [d.model_dump(mode="json") for d in docs]
+    return _json_list(_DOCUMENTS, docs)
 
 
 @router.get("/documents/{doc_id}")
-async def get_document(doc_id: str):
-    db = _get_db()
+async def get_document(doc_id: str, db: DBQueries = Depends(get_db)):
     doc = await db.get_document(doc_id)
     if not doc:
         raise HTTPException(status_code=404, detail="Document not found")
-    return doc.model_dump(mode="json")
+    return _json(doc)
 
 
 @router.post("/documents")
-async def create_document(req: CreateDocumentRequest):
+async def create_document(req: CreateDocumentRequest, db: DBQueries = Depends(get_db)):
     """Create a new document manually."""
-    db = _get_db()
-
     doc = Document(
         channel_id=req.channel_id,
         title=req.title,
@@ -254,14 +263,12 @@ async def create_document(req: CreateDocumentRequest):
     )
 
     result = await db.create_document(doc)
-    return result.model_dump(mode="json")
+    return _json(result)
 
 
 @router.put("/documents/{doc_id}")
-async def update_document(doc_id: str, req: UpdateDocumentRequest):
+async def update_document(doc_id: str, req: UpdateDocumentRequest, db: DBQueries = Depends(get_db)):
     """Update document content and create version snapshot."""
-    db = _get_db()
-
     result = await db.update_document(
         doc_id,
         req.content,
@@ -271,33 +278,29 @@ async def update_document(doc_id: str, req: UpdateDocumentRequest):
     if not result:
         raise HTTPException(status_code=404, detail="Document not found")
 
-    return result.model_dump(mode="json")
+    return _json(result)
 
 
 # --- Task endpoints ---
 
 @router.get("/channels/{channel_id}/tasks")
-async def list_tasks(channel_id: str, status: str | None = None):
-    db = _get_db()
+async def list_tasks(channel_id: str, status: str | None = None, db: DBQueries = Depends(get_db)):
     tasks = await db.list_tasks(channel_id=channel_id, status=status)
-    return [t.model_dump(mode="json") for t in tasks]
+    return _json_list(_TASKS, tasks)
 
 
 @router.get("/agents/{agent_id}/tasks")
-async def list_agent_tasks(agent_id: str, status: str | None = None):
-    db = _get_db()
+async def list_agent_tasks(agent_id: str, status: str | None = None, db: DBQueries = Depends(get_db)):
     tasks = await db.list_tasks(assigned_to=agent_id, status=status)
-    return [t.model_dump(mode="json") for t in tasks]
+    return _json_list(_TASKS, tasks)
 
 
 @router.post("/tasks/{task_id}/complete")
-async def complete_task_endpoint(task_id: str, req: CompleteTaskRequest):
+async def complete_task_endpoint(task_id: str, req: CompleteTaskRequest, db: DBQueries = Depends(get_db)):
     """Mark a task as completed with optional quality score."""
-    db = _get_db()
-
     result = await db.complete_task(task_id, req.quality_score)
 
     if not result:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    return result.model_dump(mode="json")
+    return _json(result)
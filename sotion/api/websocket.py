@@ -2,51 +2,114 @@
 
 import asyncio
 import json
+from collections import defaultdict
+from contextlib import suppress
 from typing import Any
 
 from fastapi import WebSocket, WebSocketDisconnect
 from loguru import logger
 
+try:
+    import orjson
+
+    def _dumps(data: Any) -> bytes:
+        return orjson.dumps(data)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(data: Any) -> bytes:
+        return json.dumps(data).encode()
+
+    _loads = json.loads
+
 from sotion.bus.events import InboundMessage, OutboundMessage
 from sotion.bus.queue import MessageBus
+from sotion.bus.router import classify_message
+
+# Per-socket send timeout so one stalled client can't wedge its writer forever
+SEND_TIMEOUT = 5.0
+
+# Frames buffered per client before it is treated as too slow and dropped
+OUTBOUND_QUEUE_SIZE = 256
 
 
 class ConnectionManager:
     """Manages active WebSocket connections per channel."""
 
+    __slots__ = ("connections", "_writers", "_closing")
+
     def __init__(self):
-        # channel_id -> list of websockets
-        self.connections: dict[str, list[WebSocket]] = {}
+        # channel_id -> set of websockets
+        self.connections: defaultdict[str, set[WebSocket]] = defaultdict(set)
+        # websocket -> (outbound queue, writer task)
+        self._writers: dict[WebSocket, tuple[asyncio.Queue[bytes], asyncio.Task]] = {}
+        # Closes of evicted slow clients, kept referenced until they finish
+        self._closing: set[asyncio.Task] = set()
 
     async def connect(self, websocket: WebSocket, channel_id: str) -> None:
         await websocket.accept()
-        if channel_id not in self.connections:
-            self.connections[channel_id] = []
-        self.connections[channel_id].append(websocket)
-        logger.info(f"WebSocket connected to channel {channel_id}")
+        self.connections[channel_id].add(websocket)
+        queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=OUTBOUND_QUEUE_SIZE)
+        task = asyncio.create_task(self._writer(websocket, channel_id, queue))
+        self._writers[websocket] = (queue, task)
+        logger.info("WebSocket connected to channel {}", channel_id)
 
     def disconnect(self, websocket: WebSocket, channel_id: str) -> None:
-        if channel_id in self.connections:
-            self.connections[channel_id] = [
-                ws for ws in self.connections[channel_id] if ws != websocket
-            ]
-            if not self.connections[channel_id]:
-                del self.connections[channel_id]
-        logger.info(f"WebSocket disconnected from channel {channel_id}")
+        conns = self.connections.get(channel_id)
+        if conns is not None:
+            conns.discard(websocket)
+            if not conns:
+                self.connections.pop(channel_id, None)
+        writer = self._writers.pop(websocket, None)
+        if writer is None:
+            # Already removed, e.g. by its writer after a failed send
+            return
+        writer[1].cancel()
+        logger.info("WebSocket disconnected from channel {}", channel_id)
+
+    async def _writer(
+        self, websocket: WebSocket, channel_id: str, queue: asyncio.Queue[bytes]
+    ) -> None:
+        """Drain one client's outbound queue onto its socket."""
+        try:
+            while True:
+                payload = await queue.get()
+                await asyncio.wait_for(websocket.send_bytes(payload), timeout=SEND_TIMEOUT)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Close before disconnect(), which cancels this task
+            await _close(websocket, code=1011)
+            self.disconnect(websocket, channel_id)
 
     async def broadcast_to_channel(self, channel_id: str, data: dict[str, Any]) -> None:
-        """Send a message to all WebSocket connections in a channel."""
+        """Queue a message for all WebSocket connections in a channel."""
         if channel_id not in self.connections:
             return
-        payload = json.dumps(data, default=str)
-        dead = []
-        for ws in self.connections[channel_id]:
+        # Encode once; every socket gets the same UTF-8 bytes as a binary frame
+        await self.broadcast_bytes_to_channel(channel_id, _dumps(data))
+
+    async def broadcast_bytes_to_channel(self, channel_id: str, payload: bytes) -> None:
+        """Queue an already-encoded JSON payload for all connections in a channel."""
+        conns = self.connections.get(channel_id)
+        if not conns:
+            return
+
+        # Snapshot so disconnects during the fan-out don't mutate what we iterate
+        for ws in list(conns):
+            writer = self._writers.get(ws)
+            if writer is None:
+                continue
             try:
-                await ws.send_text(payload)
-            except Exception:
-                dead.append(ws)
-        for ws in dead:
-            self.disconnect(ws, channel_id)
+                writer[0].put_nowait(payload)
+            except asyncio.QueueFull:
+                logger.warning(f"Dropping slow WebSocket client on channel {channel_id}")
+                self.disconnect(ws, channel_id)
+                # Close it so the client notices and reconnects, in the
+                # background so the rest of the channel isn't held up
+                task = asyncio.create_task(_close(ws, code=1008))
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
 
     async def broadcast_outbound(self, msg: OutboundMessage) -> None:
         """Broadcast an outbound message to the appropriate channel."""
@@ -63,34 +126,41 @@ class ConnectionManager:
         await self.broadcast_to_channel(msg.chat_id, data)
 
 
-# Global connection manager
-ws_manager = ConnectionManager()
+async def _close(websocket: WebSocket, code: int) -> None:
+    """Close an evicted client's socket, ignoring sockets that are already gone."""
+    with suppress(Exception):
+        await asyncio.wait_for(websocket.close(code=code), timeout=SEND_TIMEOUT)
+
+
+def get_ws_manager(websocket: WebSocket) -> ConnectionManager:
+    """FastAPI dependency: the app's connection manager (set up in lifespan)."""
+    return websocket.app.state.ws_manager
 
 
 async def websocket_endpoint(
     websocket: WebSocket,
     channel_id: str,
     bus: MessageBus,
+    ws_manager: ConnectionManager,
 ) -> None:
     """Handle a WebSocket connection for a channel."""
     await ws_manager.connect(websocket, channel_id)
 
     try:
         while True:
-            # Receive messages from the client
-            data = await websocket.receive_text()
-            payload = json.loads(data)
+            # Receive messages from the client; binary frames are parsed
+            # straight from bytes, text frames are still accepted
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+            data = message.get("bytes")
+            payload = _loads(data if data is not None else message["text"])
 
             content = payload.get("content", "")
             sender_name = payload.get("sender_name", "Human")
-            mentions = payload.get("mentions", [])
-
-            # Determine message type
-            message_type = "chat"
-            if "@here" in content:
-                message_type = "standup_request"
-            elif content.startswith("/"):
-                message_type = "command"
+            # Determine message type and mentions in one pass
+            message_type, parsed_mentions = classify_message(content)
+            mentions = payload.get("mentions") or parsed_mentions
 
             # Publish to bus
             msg = InboundMessage(
@@ -103,7 +173,8 @@ async def websocket_endpoint(
             )
             await bus.publish_inbound(msg)
 
-            # Echo the human message back to all clients in the channel
+            # Echo the human message back to all clients in the channel,
+            # built from the already-parsed fields and encoded exactly once
             echo = {
                 "type": "message",
                 "channel_id": channel_id,
@@ -112,7 +183,7 @@ async def websocket_endpoint(
                 "sender_name": sender_name,
                 "message_type": message_type,
             }
-            await ws_manager.broadcast_to_channel(channel_id, echo)
+            await ws_manager.broadcast_bytes_to_channel(channel_id, _dumps(echo))
 
     except WebSocketDisconnect:
         ws_manager.disconnect(websocket, channel_id)
@@ -5,7 +5,7 @@ from datetime import datetime
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class InboundMessage:
     """Message received from a channel (web UI or system)."""
 
@@ -36,7 +36,7 @@ class InboundMessage:
         return self.message_type == "command"
 
 
-@dataclass
+@dataclass(slots=True)
 class OutboundMessage:
     """Message to send to a channel."""
 
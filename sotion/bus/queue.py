@@ -29,6 +29,21 @@ class MessageBus:
     async def consume_inbound(self) -> InboundMessage:
         """Consume the next inbound message (blocks until available)."""
         return await self.inbound.get()
+
+    async def consume_inbound_batch(
+        self, max_n: int = 32, timeout: float = 1.0
+    ) -> list[InboundMessage]:
+        """
+        Consume up to `max_n` inbound messages: wait up to `timeout` for the
+        first, then take whatever else is already queued. Empty on timeout.
+        """
+        try:
+            msgs = [await asyncio.wait_for(self.inbound.get(), timeout=timeout)]
+        except asyncio.TimeoutError:
+            return []
+        while len(msgs) < max_n and not self.inbound.empty():
+            msgs.append(self.inbound.get_nowait())
+        return msgs
     
     async def publish_outbound(self, msg: OutboundMessage) -> None:
         """Publish a response from the agent to channels."""
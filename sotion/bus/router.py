@@ -14,6 +14,25 @@ if TYPE_CHECKING:
 # Pattern for @mentions: @AgentName
 MENTION_PATTERN = re.compile(r"@(\w+)")
 
+# Any of these (case-insensitive, anywhere in the text) marks an @here as a standup
+STANDUP_KEYWORDS = re.compile(r"standup|update|status|progress|report", re.IGNORECASE)
+
+
+def classify_message(content: str) -> tuple[str, list[str]]:
+    """
+    Classify inbound content in a single scan.
+
+    Returns:
+        Tuple of (message_type, mentions). ``@here`` can only occur as the
+        start of a matched mention, so it falls out of the same findall.
+    """
+    mentions = MENTION_PATTERN.findall(content) if "@" in content else []
+    if any(m.startswith("here") for m in mentions):
+        return "standup_request", mentions
+    if content.startswith("/"):
+        return "command", mentions
+    return "chat", mentions
+
 
 class MessageRouter:
     """
@@ -30,6 +49,9 @@ class MessageRouter:
 
     def parse_mentions(self, content: str) -> list[str]:
         """Extract @mentions from message content."""
+        # Most messages mention no one; a substring scan is far cheaper than the regex
+        if "@" not in content:
+            return []
         return MENTION_PATTERN.findall(content)
 
     def resolve_owner(
@@ -54,35 +76,33 @@ class MessageRouter:
         """
         mentions = message.mentions or self.parse_mentions(message.content)
         active = active_agent_names or list(agents.keys())
+        active_set = set(active)  # membership checks; `active` keeps order for results
         metadata = {}
 
         # @here -> broadcast to all active agents
         if "@here" in message.content:
             # Detect standup request
-            is_standup = any(
-                keyword in message.content.lower()
-                for keyword in ["standup", "update", "status", "progress", "report"]
-            )
+            is_standup = STANDUP_KEYWORDS.search(message.content) is not None
             metadata["is_standup"] = is_standup
-            logger.info(f"@here broadcast to {len(active)} agents (standup={is_standup})")
+            logger.info("@here broadcast to {} agents (standup={})", len(active), is_standup)
             return "broadcast", active, metadata
 
         # @AgentName -> route to that agent
         if mentions:
+            # Case-insensitive match via a lowercase name index built once per call
+            lc_index = {agent_name.lower(): agent_name for agent_name in agents}
             matched = []
             for name in mentions:
-                # Case-insensitive match
-                for agent_name in agents:
-                    if agent_name.lower() == name.lower() and agent_name in active:
-                        matched.append(agent_name)
-                        break
+                agent_name = lc_index.get(name.lower())
+                if agent_name and agent_name in active_set:
+                    matched.append(agent_name)
             if matched:
-                logger.info(f"Routed to mentioned agent(s): {matched}")
+                logger.debug("Routed to mentioned agent(s): {}", matched)
                 return "single", matched, metadata
 
         # No mention -> coordinator
-        if self.coordinator_name in agents and self.coordinator_name in active:
-            logger.info(f"No mention, routing to coordinator: {self.coordinator_name}")
+        if self.coordinator_name in agents and self.coordinator_name in active_set:
+            logger.debug("No mention, routing to coordinator: {}", self.coordinator_name)
             return "coordinator", [self.coordinator_name], metadata
 
         # Fallback: first active agent
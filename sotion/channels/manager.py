@@ -5,6 +5,7 @@ from typing import Any
 
 from loguru import logger
 
+from sotion.api.websocket import ConnectionManager
 from sotion.bus.events import OutboundMessage
 from sotion.bus.queue import MessageBus
 from sotion.channels.base import BaseChannel
@@ -17,7 +18,9 @@ from sotion.db.models import AgentUpdate
 class ChannelManager:
     """Manages the web channel and channel operations."""
 
-    def __init__(self, config: Config, bus: MessageBus, db: DBQueries):
+    def __init__(
+        self, config: Config, bus: MessageBus, db: DBQueries, ws_manager: ConnectionManager
+    ):
         self.config = config
         self.bus = bus
         self.db = db
@@ -25,7 +28,7 @@ class ChannelManager:
         self._dispatch_task: asyncio.Task | None = None
 
         # Initialize web channel
-        self.channels["web"] = WebChannel(config, bus)
+        self.channels["web"] = WebChannel(config, bus, ws_manager)
 
     async def start_all(self) -> None:
         """Start all channels and the outbound dispatcher."""
@@ -57,12 +60,14 @@ class ChannelManager:
     async def get_standup_reports(self, channel_id: str) -> list[dict[str, Any]]:
         """Get recent updates from all active agents in a channel."""
         members = await self.db.get_channel_members(channel_id, include_paused=False)
+        agents = await self.db.get_agents_bulk([m.agent_id for m in members])
+        present = [m for m in members if m.agent_id in agents]
+        all_updates = await asyncio.gather(*(
+            self.db.get_agent_updates(m.agent_id, channel_id, limit=5) for m in present
+        ))
         reports = []
-        for m in members:
-            agent = await self.db.get_agent(m.agent_id)
-            if not agent:
-                continue
-            updates = await self.db.get_agent_updates(m.agent_id, channel_id, limit=5)
+        for m, updates in zip(present, all_updates):
+            agent = agents[m.agent_id]
             reports.append({
                 "agent_name": agent.name,
                 "agent_role": agent.role,
@@ -7,7 +7,7 @@ from loguru import logger
 from sotion.bus.events import OutboundMessage
 from sotion.bus.queue import MessageBus
 from sotion.channels.base import BaseChannel
-from sotion.api.websocket import ws_manager
+from sotion.api.websocket import ConnectionManager
 
 
 class WebChannel(BaseChannel):
@@ -20,8 +20,9 @@ class WebChannel(BaseChannel):
 
     name = "web"
 
-    def __init__(self, config: Any, bus: MessageBus):
+    def __init__(self, config: Any, bus: MessageBus, ws_manager: ConnectionManager):
         super().__init__(config, bus)
+        self.ws_manager = ws_manager
         # Subscribe to outbound messages for this channel
         self.bus.subscribe_outbound("web", self._on_outbound)
 
@@ -36,7 +37,7 @@ class WebChannel(BaseChannel):
 
     async def send(self, msg: OutboundMessage) -> None:
         """Send a message through WebSocket to the web UI."""
-        await ws_manager.broadcast_outbound(msg)
+        await self.ws_manager.broadcast_outbound(msg)
 
     async def _on_outbound(self, msg: OutboundMessage) -> None:
         """Handle outbound messages from the bus."""
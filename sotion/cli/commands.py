@@ -15,6 +15,11 @@ from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 
+try:
+    import termios
+except ImportError:  # Windows
+    termios = None
+
 from sotion import __version__, __logo__
 
 app = typer.Typer(
@@ -35,21 +40,31 @@ _HISTORY_FILE: Path | None = None
 _HISTORY_HOOK_REGISTERED = False
 _USING_LIBEDIT = False
 _SAVED_TERM_ATTRS = None
+# stdin fd if it is a TTY, -1 if not; resolved on the first flush
+_STDIN_TTY_FD: int | None = None
+
+
+def _stdin_tty_fd() -> int:
+    global _STDIN_TTY_FD
+    if _STDIN_TTY_FD is None:
+        try:
+            fd = sys.stdin.fileno()
+            _STDIN_TTY_FD = fd if os.isatty(fd) else -1
+        except Exception:
+            _STDIN_TTY_FD = -1
+    return _STDIN_TTY_FD
 
 
 def _flush_pending_tty_input() -> None:
-    try:
-        fd = sys.stdin.fileno()
-        if not os.isatty(fd):
-            return
-    except Exception:
-        return
-    try:
-        import termios
-        termios.tcflush(fd, termios.TCIFLUSH)
+    fd = _stdin_tty_fd()
+    if fd < 0:
         return
-    except Exception:
-        pass
+    if termios is not None:
+        try:
+            termios.tcflush(fd, termios.TCIFLUSH)
+            return
+        except Exception:
+            pass
     try:
         while True:
             ready, _, _ = select.select([fd], [], [], 0)
@@ -74,7 +89,6 @@ def _restore_terminal() -> None:
     if _SAVED_TERM_ATTRS is None:
         return
     try:
-        import termios
         termios.tcsetattr(sys.stdin.fileno(), termios.TCSADRAIN, _SAVED_TERM_ATTRS)
     except Exception:
         pass
@@ -83,7 +97,6 @@ def _restore_terminal() -> None:
 def _enable_line_editing() -> None:
     global _READLINE, _HISTORY_FILE, _HISTORY_HOOK_REGISTERED, _USING_LIBEDIT, _SAVED_TERM_ATTRS
     try:
-        import termios
         _SAVED_TERM_ATTRS = termios.tcgetattr(sys.stdin.fileno())
     except Exception:
         pass
@@ -182,9 +195,22 @@ def _make_provider(config):
         default_model=model,
         extra_headers=p.extra_headers if p else None,
         provider_name=config.get_provider_name(),
+        max_concurrency=p.max_concurrency,
     )
 
 
+def _run_async(main) -> None:
+    """asyncio.run(main), on uvloop when it's installed (not on Windows)."""
+    from importlib.util import find_spec
+
+    loop_factory = None
+    if sys.platform != "win32" and find_spec("uvloop"):
+        import uvloop
+        loop_factory = uvloop.new_event_loop
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        runner.run(main)
+
+
 # ============================================================================
 # Serve (FastAPI server)
 # ============================================================================
@@ -197,8 +223,15 @@ def serve(
     reload: bool = typer.Option(False, "--reload", help="Enable auto-reload"),
 ):
     """Start the sotion server (FastAPI + WebSocket)."""
+    from importlib.util import find_spec
+
     import uvicorn
 
+    # uvicorn[standard] ships uvloop/httptools except where they don't build
+    # (uvloop has no Windows wheels); pin them explicitly when present
+    loop = "uvloop" if sys.platform != "win32" and find_spec("uvloop") else "asyncio"
+    http = "httptools" if find_spec("httptools") else "h11"
+
     console.print(f"{__logo__} Starting sotion server on {host}:{port}...")
     console.print(f"  API docs: http://localhost:{port}/docs")
     console.print(f"  Health:   http://localhost:{port}/health")
@@ -209,6 +242,8 @@ def serve(
         host=host,
         port=port,
         reload=reload,
+        loop=loop,
+        http=http,
     )
 
 
@@ -260,7 +295,7 @@ def agent(
                 response = await agent_loop.process_direct(message, session_id)
             _print_agent_response(response, render_markdown=markdown)
 
-        asyncio.run(run_once())
+        _run_async(run_once())
     else:
         _enable_line_editing()
         console.print(f"{__logo__} Interactive mode (type [bold]exit[/bold] or [bold]Ctrl+C[/bold] to quit)\n")
@@ -295,7 +330,7 @@ def agent(
                     console.print("\nGoodbye!")
                     break
 
-        asyncio.run(run_interactive())
+        _run_async(run_interactive())
 
 
 # ============================================================================
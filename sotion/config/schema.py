@@ -1,7 +1,7 @@
 """Configuration schema using Pydantic."""
 
 from pathlib import Path
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from pydantic_settings import BaseSettings
 
 
@@ -10,6 +10,8 @@ class SupabaseConfig(BaseModel):
     url: str = ""
     anon_key: str = ""
     service_role_key: str = ""
+    # Keep-alive HTTP connections shared by all queries; size near max_concurrent_agents
+    max_connections: int = 20
 
 
 class AgentDefaults(BaseModel):
@@ -19,6 +21,11 @@ class AgentDefaults(BaseModel):
     max_tokens: int = 8192
     temperature: float = 0.7
     max_tool_iterations: int = 20
+    # Agents processing one broadcast message at the same time
+    max_concurrent_agents: int = 16
+    # Reuse an agent's recent reply to an equivalent plain-chat message
+    # (semantic matching needs the `cache` extra)
+    response_cache: bool = False
 
 
 class AgentsConfig(BaseModel):
@@ -31,6 +38,8 @@ class ProviderConfig(BaseModel):
     api_key: str = ""
     api_base: str | None = None
     extra_headers: dict[str, str] | None = None
+    # Requests in flight to this provider at once; unset means no limit
+    max_concurrency: int | None = None
 
 
 class ProvidersConfig(BaseModel):
@@ -80,6 +89,11 @@ class Config(BaseSettings):
     server: ServerConfig = Field(default_factory=ServerConfig)
     tools: ToolsConfig = Field(default_factory=ToolsConfig)
 
+    # model -> (provider, name); providers are fixed once the config is loaded
+    _provider_cache: dict[str, tuple["ProviderConfig | None", str | None]] = PrivateAttr(
+        default_factory=dict
+    )
+
     @property
     def workspace_path(self) -> Path:
         """Get expanded workspace path."""
@@ -87,8 +101,14 @@ class Config(BaseSettings):
 
     def _match_provider(self, model: str | None = None) -> tuple["ProviderConfig | None", str | None]:
         """Match provider config and its registry name."""
+        model = model or self.agents.defaults.model
+        cached = self._provider_cache.get(model)
+        if cached is None:
+            cached = self._provider_cache[model] = self._scan_providers(model.lower())
+        return cached
+
+    def _scan_providers(self, model_lower: str) -> tuple["ProviderConfig | None", str | None]:
         from sotion.providers.registry import PROVIDERS
-        model_lower = (model or self.agents.defaults.model).lower()
 
         for spec in PROVIDERS:
             p = getattr(self.providers, spec.name, None)
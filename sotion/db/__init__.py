@@ -3,6 +3,7 @@
 from sotion.db.client import get_supabase
 from sotion.db.models import (
     Agent,
+    AgentLight,
     Channel,
     ChannelMember,
     Message,
@@ -19,6 +20,7 @@ __all__ = [
     "get_supabase",
     "DBQueries",
     "Agent",
+    "AgentLight",
     "Channel",
     "ChannelMember",
     "Message",
@@ -1,23 +1,51 @@
 """Supabase client singleton."""
 
-from supabase import create_client, Client
+import httpx
+from supabase import acreate_client, AsyncClient, AsyncClientOptions
 from loguru import logger
 
-_client: Client | None = None
+_client: AsyncClient | None = None
+_http: httpx.AsyncClient | None = None
 
+# Matches the postgrest defaults that passing our own HTTP client replaces
+POSTGREST_TIMEOUT = 120.0
 
-def get_supabase() -> Client:
+
+def get_supabase() -> AsyncClient:
     """Get the Supabase client singleton. Must call init_supabase first."""
     if _client is None:
         raise RuntimeError("Supabase not initialized. Call init_supabase() first.")
     return _client
 
 
-def init_supabase(url: str, key: str) -> Client:
-    """Initialize the Supabase client."""
-    global _client
+async def init_supabase(url: str, key: str, max_connections: int = 20) -> AsyncClient:
+    """
+    Initialize the async Supabase client, so queries yield to the event loop.
+
+    All queries share one keep-alive HTTP connection pool of at most
+    `max_connections`; a burst beyond that queues for a free connection
+    instead of opening more.
+    """
+    global _client, _http
     if _client is not None:
         return _client
-    _client = create_client(url, key)
-    logger.info("Supabase client initialized")
+    _http = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        ),
+        timeout=POSTGREST_TIMEOUT,
+        follow_redirects=True,
+        http2=True,
+    )
+    _client = await acreate_client(url, key, options=AsyncClientOptions(httpx_client=_http))
+    logger.info(f"Supabase client initialized (max {max_connections} connections)")
     return _client
+
+
+async def close_supabase() -> None:
+    """Close the shared HTTP connection pool."""
+    global _client, _http
+    if _http is not None:
+        await _http.aclose()
+    _client = _http = None
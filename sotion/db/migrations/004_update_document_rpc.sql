@@ -0,0 +1,31 @@
+-- Atomic document edit: snapshot the current version and bump it in one statement
+-- Called from DBQueries.update_document via client.rpc()
+
+CREATE OR REPLACE FUNCTION update_document_with_version(
+    doc_id UUID,
+    new_content TEXT,
+    editor UUID
+)
+RETURNS SETOF documents
+LANGUAGE sql
+AS $$
+    WITH cur AS (
+        -- Row lock serializes concurrent edits of the same document
+        SELECT id, version, content
+        FROM documents
+        WHERE id = doc_id
+        FOR UPDATE
+    ), snapshot AS (
+        INSERT INTO document_versions (document_id, version, content, edited_by)
+        SELECT id, version, COALESCE(content, ''), editor
+        FROM cur
+    )
+    UPDATE documents d
+    SET content = new_content,
+        version = cur.version + 1,
+        last_edited_by = editor,
+        updated_at = now()
+    FROM cur
+    WHERE d.id = cur.id
+    RETURNING d.*;
+$$;
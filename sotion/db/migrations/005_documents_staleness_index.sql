@@ -0,0 +1,3 @@
+-- Covers the staleness scan: active documents in a channel older than a cutoff
+CREATE INDEX IF NOT EXISTS idx_documents_channel_status_updated
+ON documents(channel_id, status, updated_at);
@@ -0,0 +1,29 @@
+-- Rolling performance score over an agent's most recent log entries
+-- Called from DBQueries.compute_rolling_score via client.rpc()
+-- Scoring: task_completed -> quality_score (default 0.7), task_failed -> 0,
+-- review_score -> score (default 0.5); other event types are ignored.
+-- Returns NULL when none of the recent entries are scored.
+
+CREATE OR REPLACE FUNCTION rolling_performance_score(
+    target_agent_id UUID,
+    max_logs INT DEFAULT 50
+)
+RETURNS FLOAT
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT AVG(
+        CASE event_type
+            WHEN 'task_completed' THEN COALESCE((details->>'quality_score')::float, 0.7)
+            WHEN 'task_failed' THEN 0.0
+            WHEN 'review_score' THEN COALESCE((details->>'score')::float, 0.5)
+        END
+    )::float
+    FROM (
+        SELECT event_type, details
+        FROM performance_log
+        WHERE agent_id = target_agent_id
+        ORDER BY created_at DESC
+        LIMIT max_logs
+    ) recent;
+$$;
@@ -0,0 +1,50 @@
+-- At most one DM channel per agent; backs DBQueries.find_dm_by_agent's
+-- single-row lookup. channels.name is already UNIQUE (001_initial.sql).
+--
+-- Earlier versions could create several DMs for the same agent, which would
+-- make the index below fail. Those are merged first: the oldest DM per agent
+-- is kept and the others' messages, members, updates, documents and tasks
+-- are moved onto it. Runs as one transaction so a failure leaves no changes.
+
+BEGIN;
+
+CREATE TEMP TABLE dm_merge ON COMMIT DROP AS
+SELECT id AS dup_id, keep_id
+FROM (
+    SELECT
+        id,
+        first_value(id) OVER (
+            PARTITION BY dm_participant_agent_id ORDER BY created_at, id
+        ) AS keep_id
+    FROM channels
+    WHERE channel_type = 'dm' AND dm_participant_agent_id IS NOT NULL
+) ranked
+WHERE id <> keep_id;
+
+UPDATE messages SET channel_id = m.keep_id
+FROM dm_merge m WHERE messages.channel_id = m.dup_id;
+
+UPDATE agent_updates SET channel_id = m.keep_id
+FROM dm_merge m WHERE agent_updates.channel_id = m.dup_id;
+
+UPDATE documents SET channel_id = m.keep_id
+FROM dm_merge m WHERE documents.channel_id = m.dup_id;
+
+UPDATE tasks SET channel_id = m.keep_id
+FROM dm_merge m WHERE tasks.channel_id = m.dup_id;
+
+-- Members already in the kept DM stay as they are; the rest are copied over
+INSERT INTO channel_members (channel_id, agent_id, is_paused, joined_at)
+SELECT m.keep_id, cm.agent_id, cm.is_paused, cm.joined_at
+FROM channel_members cm
+JOIN dm_merge m ON cm.channel_id = m.dup_id
+ON CONFLICT (channel_id, agent_id) DO NOTHING;
+
+-- Remaining member rows go with the channel (ON DELETE CASCADE)
+DELETE FROM channels WHERE id IN (SELECT dup_id FROM dm_merge);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_channels_dm_unique_participant
+ON channels(dm_participant_agent_id)
+WHERE channel_type = 'dm';
+
+COMMIT;
@@ -0,0 +1,24 @@
+-- Atomic token budget adjustments; each returns the new budget, or NULL if the
+-- agent doesn't exist. Called from DBQueries.deduct_agent_tokens / refill_agent_tokens.
+
+CREATE OR REPLACE FUNCTION deduct_agent_tokens(target_agent_id UUID, amount INT)
+RETURNS INT
+LANGUAGE sql
+AS $$
+    UPDATE agents
+    SET token_budget = GREATEST(0, token_budget - amount),
+        updated_at = now()
+    WHERE id = target_agent_id
+    RETURNING token_budget;
+$$;
+
+CREATE OR REPLACE FUNCTION refill_agent_tokens(target_agent_id UUID, amount INT)
+RETURNS INT
+LANGUAGE sql
+AS $$
+    UPDATE agents
+    SET token_budget = token_budget + amount,
+        updated_at = now()
+    WHERE id = target_agent_id
+    RETURNING token_budget;
+$$;
@@ -0,0 +1,3 @@
+-- Serves DBQueries.get_recent_agent_updates (channel + time window, newest first)
+CREATE INDEX IF NOT EXISTS idx_agent_updates_channel
+ON agent_updates(channel_id, created_at DESC);
@@ -0,0 +1,26 @@
+-- Newest agent updates per agent in a channel, for standup reports
+-- Called from DBQueries.get_recent_updates_by_agent via client.rpc()
+-- Returns at most per_agent rows for each agent created at or after `since`,
+-- ordered by agent and newest first; served by idx_agent_updates_channel.
+
+CREATE OR REPLACE FUNCTION recent_agent_updates_by_agent(
+    target_channel_id UUID,
+    since TIMESTAMPTZ,
+    per_agent INT DEFAULT 3
+)
+RETURNS SETOF agent_updates
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT id, agent_id, channel_id, summary, created_at
+    FROM (
+        SELECT u.*, ROW_NUMBER() OVER (
+            PARTITION BY u.agent_id ORDER BY u.created_at DESC
+        ) AS rn
+        FROM agent_updates u
+        WHERE u.channel_id = target_channel_id
+          AND u.created_at >= since
+    ) ranked
+    WHERE rn <= per_agent
+    ORDER BY agent_id, created_at DESC;
+$$;
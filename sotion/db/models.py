@@ -29,6 +29,16 @@ class Agent(BaseModel):
     updated_at: datetime = Field(default_factory=datetime.now)
 
 
+class AgentLight(BaseModel):
+    """Narrow projection of Agent for budget/salary paths (see DBQueries.get_agent_light)."""
+    id: str
+    name: str
+    status: str = "active"
+    performance_score: float = 0.5
+    token_budget: int = 100000
+    salary_balance: int = 0
+
+
 class Channel(BaseModel):
     id: str = Field(default_factory=_uuid)
     name: str
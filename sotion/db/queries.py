@@ -1,13 +1,18 @@
 """CRUD operations for Supabase tables."""
 
-from datetime import datetime, timedelta
-from typing import Any
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, TypeVar
 
 from loguru import logger
-from supabase import Client
+from postgrest import ReturnMethod
+from pydantic import BaseModel, TypeAdapter
+from supabase import AsyncClient
 
 from sotion.db.models import (
     Agent,
+    AgentLight,
     Channel,
     ChannelMember,
     Message,
@@ -20,65 +25,172 @@ from sotion.db.models import (
 )
 
 
+_M = TypeVar("_M", bound=BaseModel)
+
+# For writes whose row we don't read back. Inserts send every column from the
+# model, so the model passed in already is the stored row.
+_MINIMAL = ReturnMethod.minimal
+
+# Columns behind AgentLight; skips the wide prompt/learnings/config columns
+_AGENT_LIGHT_COLS = ",".join(AgentLight.model_fields)
+
+# One compiled list validator per model. Benchmarked against per-row
+# model_construct (plus fromisoformat for timestamps): pydantic-core's Rust
+# validation of the whole list is ~3x faster, and single rows ~2x.
+_LIST_ADAPTERS: dict[type[BaseModel], TypeAdapter] = {
+    cls: TypeAdapter(list[cls])
+    for cls in (
+        Agent, AgentLight, Channel, ChannelMember, Message, AgentUpdate,
+        Document, DocumentVersion, Task, PerformanceLog, Reward,
+    )
+}
+
+
+def _from_row(cls: type[_M], row: dict[str, Any]) -> _M:
+    """Build a model from a single result row."""
+    return cls.model_validate(row)
+
+
+def _from_rows(cls: type[_M], rows: list[dict[str, Any]]) -> list[_M]:
+    """Build models from a result list in one validator pass."""
+    return _LIST_ADAPTERS[cls].validate_python(rows)
+
+
 class DBQueries:
     """Database query layer wrapping Supabase client."""
 
-    def __init__(self, client: Client):
+    # Agent rows are re-read constantly (budget, evaluation, salary); serve them
+    # from a short-lived LRU. Writes through this instance update it directly,
+    # the TTL bounds staleness from writers elsewhere.
+    AGENT_CACHE_TTL = 5.0
+    AGENT_CACHE_SIZE = 1024
+    # Channel membership is read on every inbound message but changes rarely;
+    # the member writes below drop the channel's entry
+    MEMBER_CACHE_TTL = 30.0
+
+    def __init__(self, client: AsyncClient):
         self.client = client
+        self._agent_cache: OrderedDict[str, tuple[float, Agent]] = OrderedDict()
+        self._member_cache: dict[str, tuple[float, list[ChannelMember]]] = {}
+
+    def _cache_agent(self, agent: Agent) -> Agent:
+        self._agent_cache[agent.id] = (time.monotonic(), agent)
+        self._agent_cache.move_to_end(agent.id)
+        if len(self._agent_cache) > self.AGENT_CACHE_SIZE:
+            self._agent_cache.popitem(last=False)
+        return agent
 
     # --- Agents ---
 
     async def create_agent(self, agent: Agent) -> Agent:
         data = agent.model_dump(mode="json")
-        result = self.client.table("agents").insert(data).execute()
-        return Agent(**result.data[0])
+        result = await self.client.table("agents").insert(data).execute()
+        return self._cache_agent(_from_row(Agent, result.data[0]))
 
     async def get_agent(self, agent_id: str) -> Agent | None:
-        result = self.client.table("agents").select("*").eq("id", agent_id).execute()
-        return Agent(**result.data[0]) if result.data else None
+        cached = self._agent_cache.get(agent_id)
+        if cached and time.monotonic() - cached[0] < self.AGENT_CACHE_TTL:
+            self._agent_cache.move_to_end(agent_id)
+            return cached[1]
+        result = await (
+            self.client.table("agents").select("*").eq("id", agent_id).maybe_single().execute()
+        )
+        if not result:
+            self._agent_cache.pop(agent_id, None)
+            return None
+        return self._cache_agent(_from_row(Agent, result.data))
+
+    async def get_agent_light(self, agent_id: str) -> AgentLight | None:
+        """Fetch only the status/score/budget columns of an agent."""
+        cached = self._agent_cache.get(agent_id)
+        if cached and time.monotonic() - cached[0] < self.AGENT_CACHE_TTL:
+            agent = cached[1]
+            return AgentLight.model_construct(
+                **{name: getattr(agent, name) for name in AgentLight.model_fields}
+            )
+        result = await (
+            self.client.table("agents")
+            .select(_AGENT_LIGHT_COLS)
+            .eq("id", agent_id)
+            .maybe_single()
+            .execute()
+        )
+        return _from_row(AgentLight, result.data) if result else None
+
+    async def get_agents_bulk(self, agent_ids: list[str]) -> dict[str, Agent]:
+        """Fetch several agents in one query, keyed by id."""
+        if not agent_ids:
+            return {}
+        result = await self.client.table("agents").select("*").in_("id", agent_ids).execute()
+        return {agent.id: agent for agent in _from_rows(Agent, result.data)}
 
     async def get_agent_by_name(self, name: str) -> Agent | None:
-        result = self.client.table("agents").select("*").eq("name", name).execute()
-        return Agent(**result.data[0]) if result.data else None
+        result = await (
+            self.client.table("agents").select("*").eq("name", name).maybe_single().execute()
+        )
+        return _from_row(Agent, result.data) if result else None
 
     async def list_agents(self, status: str | None = None) -> list[Agent]:
         query = self.client.table("agents").select("*")
         if status:
             query = query.eq("status", status)
-        result = query.execute()
-        return [Agent(**row) for row in result.data]
+        result = await query.execute()
+        return _from_rows(Agent, result.data)
 
     async def update_agent(self, agent_id: str, **fields: Any) -> Agent | None:
-        fields["updated_at"] = datetime.now().isoformat()
-        result = self.client.table("agents").update(fields).eq("id", agent_id).execute()
-        return Agent(**result.data[0]) if result.data else None
+        fields["updated_at"] = datetime.now(timezone.utc).isoformat()
+        result = await self.client.table("agents").update(fields).eq("id", agent_id).execute()
+        if not result.data:
+            self._agent_cache.pop(agent_id, None)
+            return None
+        return self._cache_agent(_from_row(Agent, result.data[0]))
+
+    async def deduct_agent_tokens(self, agent_id: str, amount: int) -> int | None:
+        """Atomically lower an agent's token budget (floored at 0); None if no such agent."""
+        return await self._adjust_tokens("deduct_agent_tokens", agent_id, amount)
+
+    async def refill_agent_tokens(self, agent_id: str, amount: int) -> int | None:
+        """Atomically raise an agent's token budget; None if no such agent."""
+        return await self._adjust_tokens("refill_agent_tokens", agent_id, amount)
+
+    async def _adjust_tokens(self, fn: str, agent_id: str, amount: int) -> int | None:
+        result = await self.client.rpc(
+            fn, {"target_agent_id": agent_id, "amount": amount}
+        ).execute()
+        # The cached row's budget is now stale
+        self._agent_cache.pop(agent_id, None)
+        return result.data
 
     # --- Channels ---
 
     async def create_channel(self, channel: Channel) -> Channel:
         data = channel.model_dump(mode="json")
-        result = self.client.table("channels").insert(data).execute()
-        return Channel(**result.data[0])
+        result = await self.client.table("channels").insert(data).execute()
+        return _from_row(Channel, result.data[0])
 
     async def get_channel(self, channel_id: str) -> Channel | None:
-        result = self.client.table("channels").select("*").eq("id", channel_id).execute()
-        return Channel(**result.data[0]) if result.data else None
+        result = await (
+            self.client.table("channels").select("*").eq("id", channel_id).maybe_single().execute()
+        )
+        return _from_row(Channel, result.data) if result else None
 
     async def get_channel_by_name(self, name: str) -> Channel | None:
-        result = self.client.table("channels").select("*").eq("name", name).execute()
-        return Channel(**result.data[0]) if result.data else None
+        result = await (
+            self.client.table("channels").select("*").eq("name", name).maybe_single().execute()
+        )
+        return _from_row(Channel, result.data) if result else None
 
     async def list_channels(self, include_archived: bool = False) -> list[Channel]:
         """Get all project channels (excludes DMs)."""
         query = self.client.table("channels").select("*").eq("channel_type", "project")
         if not include_archived:
             query = query.eq("is_archived", False)
-        result = query.execute()
-        return [Channel(**row) for row in result.data]
+        result = await query.execute()
+        return _from_rows(Channel, result.data)
 
     async def list_dms(self, limit: int = 50) -> list[Channel]:
         """Get all DM conversations."""
-        result = (
+        result = await (
             self.client.table("channels")
             .select("*")
             .eq("channel_type", "dm")
@@ -86,62 +198,114 @@ class DBQueries:
             .limit(limit)
             .execute()
         )
-        return [Channel(**row) for row in result.data]
+        return _from_rows(Channel, result.data)
 
     async def find_dm_by_agent(self, agent_id: str) -> Channel | None:
         """Find existing DM with a specific agent."""
-        result = (
+        result = await (
             self.client.table("channels")
             .select("*")
             .eq("channel_type", "dm")
             .eq("dm_participant_agent_id", agent_id)
-            .limit(1)
+            .maybe_single()
             .execute()
         )
-        return Channel(**result.data[0]) if result.data else None
+        return _from_row(Channel, result.data) if result else None
 
     # --- Channel Members ---
 
     async def add_member(self, member: ChannelMember) -> ChannelMember:
         data = member.model_dump(mode="json")
-        result = self.client.table("channel_members").insert(data).execute()
-        return ChannelMember(**result.data[0])
+        await self.client.table("channel_members").insert(data, returning=_MINIMAL).execute()
+        self._member_cache.pop(member.channel_id, None)
+        return member
 
     async def get_channel_members(
         self, channel_id: str, include_paused: bool = True
     ) -> list[ChannelMember]:
-        query = self.client.table("channel_members").select("*").eq("channel_id", channel_id)
-        if not include_paused:
-            query = query.eq("is_paused", False)
-        result = query.execute()
-        return [ChannelMember(**row) for row in result.data]
+        cached = self._member_cache.get(channel_id)
+        if cached and time.monotonic() - cached[0] < self.MEMBER_CACHE_TTL:
+            members = cached[1]
+        else:
+            result = await (
+                self.client.table("channel_members")
+                .select("*")
+                .eq("channel_id", channel_id)
+                .execute()
+            )
+            members = _from_rows(ChannelMember, result.data)
+            self._member_cache[channel_id] = (time.monotonic(), members)
+        if include_paused:
+            return list(members)
+        return [m for m in members if not m.is_paused]
+
+    async def get_channel_members_bulk(
+        self, channel_ids: list[str], include_paused: bool = True
+    ) -> dict[str, list[ChannelMember]]:
+        """Members of several channels, fetching every uncached one in a single query."""
+        now = time.monotonic()
+        by_channel: dict[str, list[ChannelMember]] = {}
+        missing = []
+        for channel_id in dict.fromkeys(channel_ids):
+            cached = self._member_cache.get(channel_id)
+            if cached and now - cached[0] < self.MEMBER_CACHE_TTL:
+                by_channel[channel_id] = cached[1]
+            else:
+                missing.append(channel_id)
+        if missing:
+            result = await (
+                self.client.table("channel_members")
+                .select("*")
+                .in_("channel_id", missing)
+                .execute()
+            )
+            fetched: dict[str, list[ChannelMember]] = {c: [] for c in missing}
+            for member in _from_rows(ChannelMember, result.data):
+                fetched[member.channel_id].append(member)
+            now = time.monotonic()
+            for channel_id, members in fetched.items():
+                self._member_cache[channel_id] = (now, members)
+            by_channel.update(fetched)
+        return {
+            c: list(ms) if include_paused else [m for m in ms if not m.is_paused]
+            for c, ms in by_channel.items()
+        }
 
     async def set_member_paused(
         self, channel_id: str, agent_id: str, is_paused: bool
     ) -> None:
-        self.client.table("channel_members").update({"is_paused": is_paused}).eq(
-            "channel_id", channel_id
-        ).eq("agent_id", agent_id).execute()
+        await self.client.table("channel_members").update(
+            {"is_paused": is_paused}, returning=_MINIMAL
+        ).eq("channel_id", channel_id).eq("agent_id", agent_id).execute()
+        self._member_cache.pop(channel_id, None)
 
     async def pause_all_except(self, channel_id: str, except_agent_id: str) -> None:
         """Pause all agents in a channel except one (for 1:1 mode)."""
-        members = await self.get_channel_members(channel_id)
-        for m in members:
-            is_paused = m.agent_id != except_agent_id
-            await self.set_member_paused(channel_id, m.agent_id, is_paused)
+        await self.client.table("channel_members").update(
+            {"is_paused": True}, returning=_MINIMAL
+        ).eq("channel_id", channel_id).neq("agent_id", except_agent_id).execute()
+        await self.set_member_paused(channel_id, except_agent_id, False)
 
     async def unpause_all(self, channel_id: str) -> None:
         """Unpause all agents in a channel."""
-        members = await self.get_channel_members(channel_id)
-        for m in members:
-            await self.set_member_paused(channel_id, m.agent_id, False)
+        await self.client.table("channel_members").update(
+            {"is_paused": False}, returning=_MINIMAL
+        ).eq("channel_id", channel_id).eq("is_paused", True).execute()
+        self._member_cache.pop(channel_id, None)
 
     # --- Messages ---
 
     async def create_message(self, message: Message) -> Message:
         data = message.model_dump(mode="json")
-        result = self.client.table("messages").insert(data).execute()
-        return Message(**result.data[0])
+        await self.client.table("messages").insert(data, returning=_MINIMAL).execute()
+        return message
+
+    async def create_messages(self, messages: list[Message]) -> None:
+        """Insert many messages in one request."""
+        if not messages:
+            return
+        rows = [m.model_dump(mode="json") for m in messages]
+        await self.client.table("messages").insert(rows, returning=_MINIMAL).execute()
 
     async def get_channel_messages(
         self, channel_id: str, limit: int = 50, before: datetime | None = None
@@ -155,19 +319,21 @@ class DBQueries:
         )
         if before:
             query = query.lt("created_at", before.isoformat())
-        result = query.execute()
-        return [Message(**row) for row in reversed(result.data)]
+        result = await query.execute()
+        return _from_rows(Message, result.data[::-1])
 
     async def get_message(self, message_id: str) -> Message | None:
-        result = self.client.table("messages").select("*").eq("id", message_id).execute()
-        return Message(**result.data[0]) if result.data else None
+        result = await (
+            self.client.table("messages").select("*").eq("id", message_id).maybe_single().execute()
+        )
+        return _from_row(Message, result.data) if result else None
 
     # --- Agent Updates ---
 
     async def create_update(self, update: AgentUpdate) -> AgentUpdate:
         data = update.model_dump(mode="json")
-        result = self.client.table("agent_updates").insert(data).execute()
-        return AgentUpdate(**result.data[0])
+        await self.client.table("agent_updates").insert(data, returning=_MINIMAL).execute()
+        return update
 
     async def get_agent_updates(
         self, agent_id: str, channel_id: str | None = None, limit: int = 10
@@ -175,38 +341,53 @@ class DBQueries:
         query = self.client.table("agent_updates").select("*").eq("agent_id", agent_id)
         if channel_id:
             query = query.eq("channel_id", channel_id)
-        result = query.order("created_at", desc=True).limit(limit).execute()
-        return [AgentUpdate(**row) for row in result.data]
+        result = await query.order("created_at", desc=True).limit(limit).execute()
+        return _from_rows(AgentUpdate, result.data)
 
     async def get_recent_agent_updates(
-        self, channel_id: str, hours: int = 48
+        self, channel_id: str, hours: int = 48, limit: int = 200
     ) -> list[AgentUpdate]:
-        """Get recent agent updates for a channel within the last N hours."""
-        cutoff_time = (datetime.now() - timedelta(hours=hours)).isoformat()
+        """Get the newest agent updates (at most `limit`) for a channel within the last N hours."""
+        cutoff_time = (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
         query = (
             self.client.table("agent_updates")
             .select("*")
             .eq("channel_id", channel_id)
             .gte("created_at", cutoff_time)
             .order("created_at", desc=True)
+            .limit(limit)
         )
-        result = query.execute()
-        return [AgentUpdate(**row) for row in result.data]
+        result = await query.execute()
+        return _from_rows(AgentUpdate, result.data)
+
+    async def get_recent_updates_by_agent(
+        self, channel_id: str, hours: int = 48, per_agent: int = 3
+    ) -> dict[str, list[AgentUpdate]]:
+        """Newest `per_agent` updates per agent in a channel's last N hours, keyed by agent id."""
+        cutoff_time = (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
+        result = await self.client.rpc(
+            "recent_agent_updates_by_agent",
+            {"target_channel_id": channel_id, "since": cutoff_time, "per_agent": per_agent},
+        ).execute()
+        by_agent: dict[str, list[AgentUpdate]] = {}
+        for update in _from_rows(AgentUpdate, result.data or []):
+            by_agent.setdefault(update.agent_id, []).append(update)
+        return by_agent
 
     # --- Documents ---
 
     async def create_document(self, doc: Document) -> Document:
         data = doc.model_dump(mode="json")
-        result = self.client.table("documents").insert(data).execute()
-        return Document(**result.data[0])
+        result = await self.client.table("documents").insert(data).execute()
+        return _from_row(Document, result.data[0])
 
     async def get_document(self, doc_id: str) -> Document | None:
-        result = self.client.table("documents").select("*").eq("id", doc_id).execute()
-        return Document(**result.data[0]) if result.data else None
+        result = await (
+            self.client.table("documents").select("*").eq("id", doc_id).maybe_single().execute()
+        )
+        return _from_row(Document, result.data) if result else None
 
-    async def list_channel_documents(
-        self, channel_id: str, doc_type: str | None = None
-    ) -> list[Document]:
+    def _active_documents_query(self, channel_id: str, doc_type: str | None):
         query = (
             self.client.table("documents")
             .select("*")
@@ -215,54 +396,48 @@ class DBQueries:
         )
         if doc_type:
             query = query.eq("doc_type", doc_type)
-        result = query.order("updated_at", desc=True).execute()
-        return [Document(**row) for row in result.data]
+        return query
+
+    async def list_channel_documents(
+        self, channel_id: str, doc_type: str | None = None
+    ) -> list[Document]:
+        query = self._active_documents_query(channel_id, doc_type)
+        result = await query.order("updated_at", desc=True).execute()
+        return _from_rows(Document, result.data)
+
+    async def list_channel_documents_older_than(
+        self, channel_id: str, cutoff: datetime, doc_type: str | None = None
+    ) -> list[Document]:
+        """Active documents last updated before cutoff, filtered server-side."""
+        query = self._active_documents_query(channel_id, doc_type).lt(
+            "updated_at", cutoff.isoformat()
+        )
+        result = await query.order("updated_at", desc=True).execute()
+        return _from_rows(Document, result.data)
 
     async def update_document(
         self, doc_id: str, content: str, edited_by: str
     ) -> Document | None:
-        now = datetime.now().isoformat()
-        # Get current version
-        doc = await self.get_document(doc_id)
-        if not doc:
-            return None
-        new_version = doc.version + 1
-
-        # Save version snapshot
-        version = DocumentVersion(
-            document_id=doc_id,
-            version=doc.version,
-            content=doc.content,
-            edited_by=edited_by,
-        )
-        self.client.table("document_versions").insert(
-            version.model_dump(mode="json")
+        # Snapshot + version bump + update run atomically in one round trip
+        # (see migrations/004_update_document_rpc.sql)
+        result = await self.client.rpc(
+            "update_document_with_version",
+            {"doc_id": doc_id, "new_content": content, "editor": edited_by},
         ).execute()
-
-        # Update document
-        result = (
-            self.client.table("documents")
-            .update({
-                "content": content,
-                "last_edited_by": edited_by,
-                "version": new_version,
-                "updated_at": now,
-            })
-            .eq("id", doc_id)
-            .execute()
-        )
-        return Document(**result.data[0]) if result.data else None
+        return _from_row(Document, result.data[0]) if result.data else None
 
     # --- Tasks ---
 
     async def create_task(self, task: Task) -> Task:
         data = task.model_dump(mode="json")
-        result = self.client.table("tasks").insert(data).execute()
-        return Task(**result.data[0])
+        result = await self.client.table("tasks").insert(data).execute()
+        return _from_row(Task, result.data[0])
 
     async def get_task(self, task_id: str) -> Task | None:
-        result = self.client.table("tasks").select("*").eq("id", task_id).execute()
-        return Task(**result.data[0]) if result.data else None
+        result = await (
+            self.client.table("tasks").select("*").eq("id", task_id).maybe_single().execute()
+        )
+        return _from_row(Task, result.data) if result else None
 
     async def list_tasks(
         self,
@@ -277,13 +452,13 @@ class DBQueries:
             query = query.eq("assigned_to", assigned_to)
         if status:
             query = query.eq("status", status)
-        result = query.order("priority", desc=True).execute()
-        return [Task(**row) for row in result.data]
+        result = await query.order("priority", desc=True).execute()
+        return _from_rows(Task, result.data)
 
     async def complete_task(
         self, task_id: str, quality_score: float | None = None
     ) -> Task | None:
-        now = datetime.now().isoformat()
+        now = datetime.now(timezone.utc).isoformat()
         fields: dict[str, Any] = {
             "status": "completed",
             "completed_at": now,
@@ -291,20 +466,38 @@ class DBQueries:
         }
         if quality_score is not None:
             fields["quality_score"] = quality_score
-        result = self.client.table("tasks").update(fields).eq("id", task_id).execute()
-        return Task(**result.data[0]) if result.data else None
+        result = await self.client.table("tasks").update(fields).eq("id", task_id).execute()
+        return _from_row(Task, result.data[0]) if result.data else None
 
     # --- Performance Log ---
 
     async def log_performance(self, log: PerformanceLog) -> PerformanceLog:
         data = log.model_dump(mode="json")
-        result = self.client.table("performance_log").insert(data).execute()
-        return PerformanceLog(**result.data[0])
+        await self.client.table("performance_log").insert(data, returning=_MINIMAL).execute()
+        return log
+
+    async def bulk_log_performance(self, logs: list[PerformanceLog]) -> None:
+        """Insert many performance events in one request."""
+        if not logs:
+            return
+        # Built from the known fields rather than model_dump: details is already
+        # plain JSON data, so only the timestamp needs converting
+        rows = [
+            {
+                "id": log.id,
+                "agent_id": log.agent_id,
+                "event_type": log.event_type,
+                "details": log.details,
+                "created_at": log.created_at.isoformat(),
+            }
+            for log in logs
+        ]
+        await self.client.table("performance_log").insert(rows, returning=_MINIMAL).execute()
 
     async def get_performance_logs(
         self, agent_id: str, limit: int = 50
     ) -> list[PerformanceLog]:
-        result = (
+        result = await (
             self.client.table("performance_log")
             .select("*")
             .eq("agent_id", agent_id)
@@ -312,17 +505,25 @@ class DBQueries:
             .limit(limit)
             .execute()
         )
-        return [PerformanceLog(**row) for row in result.data]
+        return _from_rows(PerformanceLog, result.data)
+
+    async def compute_rolling_score(self, agent_id: str, limit: int = 50) -> float | None:
+        """Average score over the last `limit` log entries, aggregated in Postgres."""
+        result = await self.client.rpc(
+            "rolling_performance_score",
+            {"target_agent_id": agent_id, "max_logs": limit},
+        ).execute()
+        return result.data
 
     # --- Rewards ---
 
     async def create_reward(self, reward: Reward) -> Reward:
         data = reward.model_dump(mode="json")
-        result = self.client.table("rewards").insert(data).execute()
-        return Reward(**result.data[0])
+        await self.client.table("rewards").insert(data, returning=_MINIMAL).execute()
+        return reward
 
     async def get_agent_rewards(self, agent_id: str, limit: int = 50) -> list[Reward]:
-        result = (
+        result = await (
             self.client.table("rewards")
             .select("*")
             .eq("agent_id", agent_id)
@@ -330,4 +531,4 @@ class DBQueries:
             .limit(limit)
             .execute()
         )
-        return [Reward(**row) for row in result.data]
+        return _from_rows(Reward, result.data)
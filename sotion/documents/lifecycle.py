@@ -1,6 +1,6 @@
 """Document lifecycle: staleness detection and review triggers."""
 
-from datetime import datetime
+from datetime import datetime, timezone
 
 from loguru import logger
 
@@ -17,8 +17,10 @@ class DocumentLifecycle:
         """Check for stale documents and return review suggestions."""
         stale = await self.doc_manager.find_stale_documents(channel_id)
         suggestions = []
+        # updated_at comes back from TIMESTAMPTZ columns, so compare in UTC
+        now = datetime.now(timezone.utc)
         for doc in stale:
-            days_old = (datetime.now() - doc.updated_at).days
+            days_old = (now - doc.updated_at).days
             suggestions.append({
                 "document_id": doc.id,
                 "title": doc.title,
@@ -1,6 +1,6 @@
 """Document manager: CRUD with versioning and lifecycle."""
 
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from sotion.db.queries import DBQueries
 from sotion.db.models import Document
@@ -47,6 +47,6 @@ class DocumentManager:
 
     async def find_stale_documents(self, channel_id: str) -> list[Document]:
         """Find documents that haven't been updated in STALENESS_DAYS."""
-        docs = await self.db.list_channel_documents(channel_id)
-        cutoff = datetime.now() - timedelta(days=self.STALENESS_DAYS)
-        return [d for d in docs if d.updated_at < cutoff]
+        # Offset-aware so Postgres compares it correctly against TIMESTAMPTZ
+        cutoff = datetime.now(timezone.utc) - timedelta(days=self.STALENESS_DAYS)
+        return await self.db.list_channel_documents_older_than(channel_id, cutoff)
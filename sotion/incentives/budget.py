@@ -13,28 +13,27 @@ class BudgetManager:
 
     async def check_budget(self, agent_id: str) -> tuple[bool, int]:
         """Check if agent has budget remaining. Returns (has_budget, remaining)."""
-        agent = await self.db.get_agent(agent_id)
+        agent = await self.db.get_agent_light(agent_id)
         if not agent:
             return False, 0
         return agent.token_budget > 0, agent.token_budget
 
     async def deduct_tokens(self, agent_id: str, tokens_used: int) -> int:
         """Deduct tokens from agent's budget. Returns remaining budget."""
-        agent = await self.db.get_agent(agent_id)
-        if not agent:
+        new_budget = await self.db.deduct_agent_tokens(agent_id, tokens_used)
+        if new_budget is None:
             return 0
-        new_budget = max(0, agent.token_budget - tokens_used)
-        await self.db.update_agent(agent_id, token_budget=new_budget)
         if new_budget == 0:
-            logger.warning(f"Agent {agent.name} has exhausted token budget")
+            # Rare, so the name lookup stays off the common path
+            agent = await self.db.get_agent_light(agent_id)
+            name = agent.name if agent else agent_id
+            logger.warning(f"Agent {name} has exhausted token budget")
         return new_budget
 
     async def refill_budget(self, agent_id: str, amount: int) -> int:
         """Refill an agent's token budget. Returns new budget."""
-        agent = await self.db.get_agent(agent_id)
-        if not agent:
+        new_budget = await self.db.refill_agent_tokens(agent_id, amount)
+        if new_budget is None:
             return 0
-        new_budget = agent.token_budget + amount
-        await self.db.update_agent(agent_id, token_budget=new_budget)
-        logger.info(f"Refilled {agent.name} budget by {amount} -> {new_budget}")
+        logger.info(f"Refilled agent {agent_id} budget by {amount} -> {new_budget}")
         return new_budget
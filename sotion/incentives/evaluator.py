@@ -1,5 +1,7 @@
 """Performance evaluator: rolling scores, warnings, firing, bonuses."""
 
+import asyncio
+
 from loguru import logger
 
 from sotion.db.queries import DBQueries
@@ -25,23 +27,14 @@ class PerformanceEvaluator:
 
         Returns a dict with score, status, and any actions taken.
         """
-        logs = await self.db.get_performance_logs(agent_id, limit=50)
-        agent = await self.db.get_agent(agent_id)
+        agent, new_score = await asyncio.gather(
+            self.db.get_agent(agent_id),
+            self.db.compute_rolling_score(agent_id, limit=50),
+        )
         if not agent:
             return {"error": "Agent not found"}
 
-        # Calculate rolling score
-        scores = []
-        for log in logs:
-            if log.event_type == "task_completed":
-                qs = log.details.get("quality_score")
-                scores.append(qs if qs is not None else 0.7)
-            elif log.event_type == "task_failed":
-                scores.append(0.0)
-            elif log.event_type == "review_score":
-                scores.append(log.details.get("score", 0.5))
-
-        if not scores:
+        if new_score is None:
             return {
                 "agent_name": agent.name,
                 "score": agent.performance_score,
@@ -49,7 +42,6 @@ class PerformanceEvaluator:
                 "action": "none",
             }
 
-        new_score = sum(scores) / len(scores)
         action = "none"
 
         # Apply consequences
@@ -62,17 +54,22 @@ class PerformanceEvaluator:
             action = "warning"
             logger.warning(f"Agent {agent.name} WARNING (score: {new_score:.2f})")
         elif new_score >= BONUS_THRESHOLD:
-            await self.db.update_agent(agent_id, performance_score=new_score, status="active")
-            # Award bonus
+            # Award bonus: one agent UPDATE and the reward INSERT, concurrently
             reward = Reward(
                 agent_id=agent_id,
                 reward_type="bonus",
                 amount=BONUS_AMOUNT,
                 reason=f"High performance score: {new_score:.2f}",
             )
-            await self.db.create_reward(reward)
-            new_salary = agent.salary_balance + BONUS_AMOUNT
-            await self.db.update_agent(agent_id, salary_balance=new_salary)
+            await asyncio.gather(
+                self.db.update_agent(
+                    agent_id,
+                    performance_score=new_score,
+                    status="active",
+                    salary_balance=agent.salary_balance + BONUS_AMOUNT,
+                ),
+                self.db.create_reward(reward),
+            )
             action = "bonus"
             logger.info(f"Agent {agent.name} BONUS +{BONUS_AMOUNT} (score: {new_score:.2f})")
         else:
@@ -87,18 +84,19 @@ class PerformanceEvaluator:
 
     async def pay_salary(self, agent_id: str) -> int:
         """Pay the regular salary cycle to an agent. Returns new balance."""
-        agent = await self.db.get_agent(agent_id)
+        agent = await self.db.get_agent_light(agent_id)
         if not agent or agent.status == "fired":
             return 0
 
         new_balance = agent.salary_balance + SALARY_PER_CYCLE
-        await self.db.update_agent(agent_id, salary_balance=new_balance)
-
         reward = Reward(
             agent_id=agent_id,
             reward_type="salary",
             amount=SALARY_PER_CYCLE,
             reason="Regular salary cycle",
         )
-        await self.db.create_reward(reward)
+        await asyncio.gather(
+            self.db.update_agent(agent_id, salary_balance=new_balance),
+            self.db.create_reward(reward),
+        )
         return new_balance
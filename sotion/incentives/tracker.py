@@ -1,14 +1,68 @@
 """Performance tracker: logs task completions, failures, token usage."""
 
+import asyncio
+
+from loguru import logger
+
 from sotion.db.queries import DBQueries
 from sotion.db.models import PerformanceLog
 
 
+# Events are buffered and written in bulk: at most this many per INSERT...
+FLUSH_BATCH_SIZE = 500
+# ...and no later than this many seconds after the first one was queued
+FLUSH_INTERVAL = 0.2
+
+
 class PerformanceTracker:
     """Tracks agent performance events."""
 
     def __init__(self, db: DBQueries):
         self.db = db
+        self._queue: asyncio.Queue[PerformanceLog] = asyncio.Queue()
+        self._flusher_task: asyncio.Task | None = None
+
+    def _enqueue(self, log: PerformanceLog) -> None:
+        self._queue.put_nowait(log)
+        if self._flusher_task is None or self._flusher_task.done():
+            self._flusher_task = asyncio.create_task(self._flusher())
+
+    async def _flusher(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                # Let the batch fill for one interval, then take what arrived
+                await asyncio.sleep(FLUSH_INTERVAL)
+            finally:
+                # Also on cancellation: don't drop events already dequeued
+                while len(batch) < FLUSH_BATCH_SIZE and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                await self._write(batch)
+
+    async def _write(self, batch: list[PerformanceLog]) -> None:
+        try:
+            await self.db.bulk_log_performance(batch)
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} performance events: {e}")
+
+    async def flush(self) -> None:
+        """Write out everything queued so far."""
+        batch = []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        if batch:
+            await self._write(batch)
+
+    async def close(self) -> None:
+        """Stop the background flusher and write any remaining events."""
+        task, self._flusher_task = self._flusher_task, None
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
 
     async def log_task_completed(
         self, agent_id: str, task_id: str, quality_score: float | None = None
@@ -18,7 +72,7 @@ class PerformanceTracker:
             event_type="task_completed",
             details={"task_id": task_id, "quality_score": quality_score},
         )
-        await self.db.log_performance(log)
+        self._enqueue(log)
 
     async def log_task_failed(self, agent_id: str, task_id: str, reason: str = "") -> None:
         log = PerformanceLog(
@@ -26,7 +80,7 @@ class PerformanceTracker:
             event_type="task_failed",
             details={"task_id": task_id, "reason": reason},
         )
-        await self.db.log_performance(log)
+        self._enqueue(log)
 
     async def log_review_score(
         self, agent_id: str, task_id: str, score: float
@@ -36,7 +90,7 @@ class PerformanceTracker:
             event_type="review_score",
             details={"task_id": task_id, "score": score},
         )
-        await self.db.log_performance(log)
+        self._enqueue(log)
 
     async def log_token_usage(
         self, agent_id: str, tokens_used: int, model: str
@@ -46,4 +100,4 @@ class PerformanceTracker:
             event_type="token_usage",
             details={"tokens_used": tokens_used, "model": model},
         )
-        await self.db.log_performance(log)
+        self._enqueue(log)
@@ -4,17 +4,18 @@ import asyncio
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI, WebSocket
+from fastapi import Depends, FastAPI, Response, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
+from pydantic import BaseModel
 
-from sotion.api.routes import router as api_router
-from sotion.api.websocket import websocket_endpoint, ws_manager
+from sotion.api.routes import get_db, router as api_router
+from sotion.api.websocket import ConnectionManager, get_ws_manager, websocket_endpoint
 from sotion.bus.queue import MessageBus
 from sotion.config.loader import load_config
-from sotion.db.client import init_supabase, get_supabase
-from sotion.db.queries import DBQueries
+from sotion.db.client import close_supabase, init_supabase
 from sotion.orchestrator import SotionOrchestrator
+from sotion.agents.response_cache import ResponseCache
 from sotion.channels.manager import ChannelManager
 
 # Global state
@@ -32,20 +33,25 @@ async def lifespan(app: FastAPI):
 
     # Initialize Supabase
     if config.supabase.url and config.supabase.service_role_key:
-        init_supabase(config.supabase.url, config.supabase.service_role_key)
+        await init_supabase(
+            config.supabase.url,
+            config.supabase.service_role_key,
+            max_connections=config.supabase.max_connections,
+        )
         logger.info("Supabase connected")
     else:
         logger.warning("Supabase not configured — running without persistence")
 
-    # Initialize message bus
+    # Initialize message bus and the WebSocket connection manager
     _bus = MessageBus()
+    app.state.ws_manager = ConnectionManager()
 
     # Initialize LLM provider
     from sotion.providers.litellm_provider import LiteLLMProvider
     provider = LiteLLMProvider.from_config(config)
 
-    # Initialize DB queries
-    db = DBQueries(get_supabase()) if config.supabase.url else None
+    # Share the API routes' DBQueries so its caches see every write
+    db = get_db() if config.supabase.url else None
 
     # Initialize orchestrator
     workspace = config.workspace_path
@@ -56,17 +62,18 @@ async def lifespan(app: FastAPI):
         provider=provider,
         workspace=workspace,
         db=db,
+        response_cache=ResponseCache() if config.agents.defaults.response_cache else None,
+        max_concurrent_agents=config.agents.defaults.max_concurrent_agents,
     )
 
     # Load agents from database
     if db:
         agents = await db.list_agents(status="active")
-        for agent_config in agents:
-            await _orchestrator.register_agent(agent_config)
+        await _orchestrator.register_agents(agents)
 
     # Initialize channel manager
     if db:
-        _channel_manager = ChannelManager(config, _bus, db)
+        _channel_manager = ChannelManager(config, _bus, db, app.state.ws_manager)
         await _channel_manager.start_all()
 
     # Start orchestrator in background
@@ -78,11 +85,13 @@ async def lifespan(app: FastAPI):
     # Shutdown
     if _orchestrator:
         _orchestrator.stop()
+        await _orchestrator.close()
     if _channel_manager:
         await _channel_manager.stop_all()
     if _bus:
         _bus.stop()
     orchestrator_task.cancel()
+    await close_supabase()
     logger.info("Sotion server stopped")
 
 
@@ -108,8 +117,12 @@ app.include_router(api_router, prefix="/api")
 
 # WebSocket endpoint
 @app.websocket("/ws/{channel_id}")
-async def ws_route(websocket: WebSocket, channel_id: str):
-    await websocket_endpoint(websocket, channel_id, _bus)
+async def ws_route(
+    websocket: WebSocket,
+    channel_id: str,
+    ws_manager: ConnectionManager = Depends(get_ws_manager),
+):
+    await websocket_endpoint(websocket, channel_id, _bus, ws_manager)
 
 
 @app.get("/health")
@@ -120,19 +133,33 @@ async def health():
     }
 
 
-# Message sending endpoint (triggers orchestrator)
-@app.post("/api/channels/{channel_id}/send")
-async def send_message(channel_id: str, body: dict):
+class AgentReply(BaseModel):
+    content: str
+    sender_name: str | None = None
+    sender_role: str | None = None
+
+
+class SendResponse(BaseModel):
+    responses: list[AgentReply]
+
+
+# Message sending endpoint (triggers orchestrator). response_model only
+# documents the shape; the body is dumped by pydantic-core and returned as a
+# Response, which FastAPI sends without re-validating or re-encoding it.
+@app.post("/api/channels/{channel_id}/send", response_model=SendResponse)
+async def send_message(channel_id: str, body: dict) -> Response:
     """Send a message and get agent responses."""
     from sotion.bus.events import InboundMessage
+    from sotion.bus.router import classify_message
 
     content = body.get("content", "")
     sender_name = body.get("sender_name", "Human")
-    mentions = body.get("mentions", [])
 
-    message_type = "chat"
-    if "@here" in content:
-        message_type = "standup_request"
+    message_type, parsed_mentions = classify_message(content)
+    # This endpoint never treated slash-prefixed content as a command
+    if message_type == "command":
+        message_type = "chat"
+    mentions = body.get("mentions") or parsed_mentions
 
     msg = InboundMessage(
         channel="web",
@@ -143,16 +170,15 @@ async def send_message(channel_id: str, body: dict):
         mentions=mentions,
     )
 
+    result = SendResponse(responses=[])
     if _orchestrator:
         responses = await _orchestrator.process_message(msg)
-        return {
-            "responses": [
-                {
-                    "content": r.content,
-                    "sender_name": r.sender_agent_name,
-                    "sender_role": r.sender_agent_role,
-                }
-                for r in responses
-            ]
-        }
-    return {"responses": []}
+        result.responses = [
+            AgentReply(
+                content=r.content,
+                sender_name=r.sender_agent_name,
+                sender_role=r.sender_agent_role,
+            )
+            for r in responses
+        ]
+    return Response(content=result.model_dump_json(), media_type="application/json")
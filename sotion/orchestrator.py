@@ -1,9 +1,11 @@
 """Multi-agent orchestrator: manages N agent loops with message routing."""
 
 import asyncio
+from collections import defaultdict
+from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Awaitable, Callable
 
 from loguru import logger
 
@@ -16,6 +18,7 @@ from sotion.session.manager import SessionManager
 from sotion.db.client import get_supabase
 from sotion.db.queries import DBQueries
 from sotion.db.models import Agent, Message
+from sotion.agents.response_cache import ResponseCache
 from sotion.agents.tools import (
     DelegateTool,
     LogUpdateTool,
@@ -24,39 +27,94 @@ from sotion.agents.tools import (
     QueryDocsTool,
     CreateTaskTool,
     CompleteTaskTool,
+    current_channel_id,
 )
 
 
 # Role -> allowed tools mapping
-ROLE_TOOLS = {
-    "coordinator": [
+ROLE_TOOLS: dict[str, frozenset[str]] = {
+    "coordinator": frozenset({
         "delegate", "message", "log_update",
         "create_doc", "edit_doc", "query_docs",
-    ],
-    "developer": [
+    }),
+    "developer": frozenset({
         "read_file", "write_file", "edit_file", "list_dir", "exec",
         "web_search", "web_fetch", "log_update",
         "create_doc", "edit_doc", "query_docs",
-    ],
-    "reviewer": [
+    }),
+    "reviewer": frozenset({
         "read_file", "list_dir", "web_search", "web_fetch", "log_update",
         "create_doc", "edit_doc", "query_docs",
-    ],
-    "planner": [
+    }),
+    "planner": frozenset({
         "create_doc", "edit_doc", "query_docs", "create_task",
         "read_file", "list_dir", "log_update",
-    ],
-    "researcher": [
+    }),
+    "researcher": frozenset({
         "read_file", "list_dir", "web_search", "web_fetch",
         "create_doc", "edit_doc", "query_docs", "log_update",
-    ],
-    "documenter": [
+    }),
+    "documenter": frozenset({
         "create_doc", "edit_doc", "query_docs", "read_file",
         "list_dir", "log_update",
-    ],
+    }),
 }
 
 
+# Fixed structure every agent fills in for a standup; the report formatter
+# relies on agents answering in this shape
+STANDUP_PROMPT = """
+This is a standup request. Please provide a brief update on your recent work:
+
+1. **What you've worked on recently** (last 24-48 hours)
+2. **Current tasks** (what you're doing now)
+3. **Blockers or questions** (if any)
+
+Use the `log_update` tool to record your update, then respond with a summary.
+Format your response as:
+
+**[Your Name] - [Your Role]**
+- Recent: [brief summary]
+- Current: [current task]
+- Blockers: [any issues or "None"]
+"""
+
+_STANDUP_REPORT_HEADER = "## 📊 Team Standup Report\n"
+_STANDUP_REPORT_FOOTER = "\n---\n*Use `log_update` tool to record your progress*"
+
+# Chat history is persisted in the background, at most this many rows per
+# INSERT; when the backlog is full, new messages are dropped with a warning
+WRITE_BATCH_SIZE = 128
+WRITE_QUEUE_SIZE = 10_000
+# Seconds the writer lingers after the first queued message so messages
+# arriving together (busy channels, cached replies) share one INSERT
+WRITE_INTERVAL = 0.05
+
+# Seconds close() waits for bus messages still being processed
+SHUTDOWN_TIMEOUT = 10.0
+
+# Inbound messages taken off the bus per wake-up when a backlog builds
+INBOUND_BATCH_SIZE = 32
+
+ROLES_DIR = Path(__file__).parent / "agents" / "roles"
+_ROLE_PROMPT_CACHE: dict[str, str] = {}
+
+
+def refresh_role_prompts() -> None:
+    """(Re)load every role prompt from ROLES_DIR; role files are static at runtime."""
+    prompts = {}
+    for role_file in ROLES_DIR.glob("*.md"):
+        try:
+            prompts[role_file.stem] = role_file.read_text(encoding="utf-8")
+        except Exception as e:
+            logger.error(f"Failed to load role file {role_file}: {e}")
+    _ROLE_PROMPT_CACHE.clear()
+    _ROLE_PROMPT_CACHE.update(prompts)
+
+
+refresh_role_prompts()
+
+
 class SotionOrchestrator:
     """
     Manages multiple AgentLoop instances, routes messages between them.
@@ -71,30 +129,38 @@ class SotionOrchestrator:
         workspace: Path,
         db: DBQueries,
         coordinator_name: str = "Max",
+        response_cache: ResponseCache | None = None,
+        max_concurrent_agents: int = 16,
     ):
         self.bus = bus
         self.provider = provider
         self.workspace = workspace
         self.db = db
+        self.response_cache = response_cache
+        # Caps concurrent LLM sessions when a message fans out to many agents
+        self._agent_semaphore = asyncio.Semaphore(max_concurrent_agents)
         self.router = MessageRouter(coordinator_name=coordinator_name)
         self.agents: dict[str, AgentLoop] = {}
         self.agent_configs: dict[str, Agent] = {}  # name -> DB agent record
+        self.agent_configs_by_id: dict[str, Agent] = {}  # id -> DB agent record
+        self.agents_by_role: defaultdict[str, list[str]] = defaultdict(list)  # role -> names
+        self._write_queue: asyncio.Queue[Message] = asyncio.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self._writer_task: asyncio.Task | None = None
+        # Messages being processed right now, so identical concurrent
+        # deliveries (client retries, duplicate sends) share one run
+        self._inflight: dict[tuple, asyncio.Task] = {}
+        self._inflight_waiters: defaultdict[tuple, int] = defaultdict(int)
+        # Bus messages being handled, and the locks keeping each channel in order
+        self._tasks: set[asyncio.Task] = set()
+        self._channel_locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
         self._running = False
 
     def _load_role_prompt(self, role: str) -> str | None:
-        """Load role-specific prompt from markdown file."""
-        roles_dir = Path(__file__).parent / "agents" / "roles"
-        role_file = roles_dir / f"{role}.md"
-
-        if not role_file.exists():
-            logger.warning(f"Role file not found: {role_file}")
-            return None
-
-        try:
-            return role_file.read_text(encoding="utf-8")
-        except Exception as e:
-            logger.error(f"Failed to load role file {role_file}: {e}")
-            return None
+        """Look up the role-specific prompt loaded from ROLES_DIR."""
+        prompt = _ROLE_PROMPT_CACHE.get(role)
+        if prompt is None:
+            logger.warning(f"Role file not found: {ROLES_DIR / f'{role}.md'}")
+        return prompt
 
     async def _build_team_roster(self, channel_id: str | None = None) -> list[dict[str, str]]:
         """Build team roster for agent context."""
@@ -104,10 +170,7 @@ class SotionOrchestrator:
             # Get agents in this channel
             members = await self.db.get_channel_members(channel_id, include_paused=True)
             for member in members:
-                agent_config = next(
-                    (c for c in self.agent_configs.values() if c.id == member.agent_id),
-                    None
-                )
+                agent_config = self.agent_configs_by_id.get(member.agent_id)
                 if agent_config:
                     roster.append({
                         "name": agent_config.name,
@@ -135,7 +198,7 @@ class SotionOrchestrator:
         }
 
     def _register_sotion_tools(
-        self, loop: AgentLoop, agent_config: Agent, allowed_tools: list[str]
+        self, loop: AgentLoop, agent_config: Agent, allowed_tools: frozenset[str]
     ) -> None:
         """Register Sotion-specific tools based on role."""
 
@@ -156,7 +219,7 @@ class SotionOrchestrator:
             log_tool = LogUpdateTool(
                 db=self.db,
                 agent_id=agent_config.id,
-                channel_id="",  # Set per-message
+                channel_id="",  # Read per-message from current_channel_id
             )
             loop.tools.register(log_tool)
 
@@ -164,7 +227,7 @@ class SotionOrchestrator:
         if "create_doc" in allowed_tools:
             create_doc_tool = CreateDocTool(
                 db=self.db,
-                channel_id="",  # Set per-message
+                channel_id="",  # Read per-message from current_channel_id
                 agent_id=agent_config.id,
             )
             loop.tools.register(create_doc_tool)
@@ -179,7 +242,7 @@ class SotionOrchestrator:
         if "query_docs" in allowed_tools:
             query_docs_tool = QueryDocsTool(
                 db=self.db,
-                channel_id="",  # Set per-message
+                channel_id="",  # Read per-message from current_channel_id
             )
             loop.tools.register(query_docs_tool)
 
@@ -187,7 +250,7 @@ class SotionOrchestrator:
         if "create_task" in allowed_tools:
             create_task_tool = CreateTaskTool(
                 db=self.db,
-                channel_id="",  # Set per-message
+                channel_id="",  # Read per-message from current_channel_id
             )
             loop.tools.register(create_task_tool)
 
@@ -195,12 +258,24 @@ class SotionOrchestrator:
             complete_task_tool = CompleteTaskTool(db=self.db)
             loop.tools.register(complete_task_tool)
 
-    async def register_agent(self, agent_config: Agent) -> AgentLoop:
+    async def register_agents(self, agent_configs: list[Agent]) -> None:
+        """Register a batch of agents, building the shared team roster once."""
+        team_roster = [
+            {"name": c.name, "role": c.role, "status": c.status}
+            for c in {**self.agent_configs, **{c.name: c for c in agent_configs}}.values()
+        ]
+        for agent_config in agent_configs:
+            await self.register_agent(agent_config, team_roster=team_roster)
+
+    async def register_agent(
+        self, agent_config: Agent, team_roster: list[dict[str, str]] | None = None
+    ) -> AgentLoop:
         """
         Create and register an AgentLoop for an agent.
 
         Args:
             agent_config: Agent configuration from the database.
+            team_roster: Roster to show the agent; defaults to all registered agents.
 
         Returns:
             The created AgentLoop.
@@ -218,7 +293,8 @@ class SotionOrchestrator:
         role_prompt = self._load_role_prompt(agent_config.role)
 
         # Build team roster (all registered agents initially)
-        team_roster = await self._build_team_roster(channel_id=None)
+        if team_roster is None:
+            team_roster = await self._build_team_roster(channel_id=None)
 
         # Build economy status
         economy_status = self._build_economy_status(agent_config)
@@ -233,7 +309,7 @@ class SotionOrchestrator:
         )
 
         # Configure tools based on role
-        allowed_tools = ROLE_TOOLS.get(agent_config.role, [])
+        allowed_tools = ROLE_TOOLS.get(agent_config.role, frozenset())
 
         # Register Sotion-specific tools
         self._register_sotion_tools(loop, agent_config, allowed_tools)
@@ -241,8 +317,14 @@ class SotionOrchestrator:
         # Remove non-allowed default tools
         self._configure_tools(loop, agent_config, allowed_tools)
 
+        previous = self.agent_configs.get(agent_config.name)
+        if previous is not None:
+            self.agents_by_role[previous.role].remove(previous.name)
+            self.agent_configs_by_id.pop(previous.id, None)
         self.agents[agent_config.name] = loop
         self.agent_configs[agent_config.name] = agent_config
+        self.agent_configs_by_id[agent_config.id] = agent_config
+        self.agents_by_role[agent_config.role].append(agent_config.name)
 
         logger.info(
             f"Registered agent: {agent_config.name} "
@@ -251,33 +333,105 @@ class SotionOrchestrator:
         return loop
 
     def _configure_tools(
-        self, loop: AgentLoop, agent_config: Agent, allowed_tools: list[str]
+        self, loop: AgentLoop, agent_config: Agent, allowed_tools: frozenset[str]
     ) -> None:
         """Remove tools not in the agent's allowed list."""
-        all_tool_names = list(loop.tools.tool_names)
-        for tool_name in all_tool_names:
-            if tool_name not in allowed_tools:
-                loop.tools.unregister(tool_name)
+        to_remove = set(loop.tools.tool_names) - allowed_tools
+        for tool_name in to_remove:
+            loop.tools.unregister(tool_name)
 
     async def get_active_agents(self, channel_id: str) -> list[str]:
         """Get names of non-paused agents in a channel."""
         members = await self.db.get_channel_members(channel_id, include_paused=False)
         agent_names = []
         for m in members:
-            config = next(
-                (c for c in self.agent_configs.values() if c.id == m.agent_id), None
-            )
+            config = self.agent_configs_by_id.get(m.agent_id)
             if config and config.name in self.agents:
                 agent_names.append(config.name)
         return agent_names
 
-    async def process_message(self, message: InboundMessage) -> list[OutboundMessage]:
+    async def process_message(
+        self,
+        message: InboundMessage,
+        on_response: Callable[[OutboundMessage], Awaitable[None]] | None = None,
+    ) -> list[OutboundMessage]:
         """
         Route and process an inbound message.
 
+        An identical message (same channel, sender, type, content, mentions
+        and media) arriving while the first is still being processed is
+        stored, then waits for and returns the same responses instead of
+        running the agents again.
+        Cancelling every caller (timeout, shutdown) cancels the run itself.
+
+        Args:
+            message: The inbound message.
+            on_response: If given, each reply to a (non-standup) broadcast is
+                passed to it as soon as that agent finishes, rather than after
+                the slowest one; those replies are not returned again.
+
         Returns:
             List of outbound responses (one per responding agent).
         """
+        key = self._inflight_key(message, streaming=on_response is not None)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._process_message(message, on_response))
+            self._inflight[key] = task
+            task.add_done_callback(
+                lambda t: self._inflight.pop(key, None) if self._inflight.get(key) is t else None
+            )
+        else:
+            logger.debug("Joining in-flight run of a duplicate message in {}", message.chat_id)
+            # The user did send it twice, so the history keeps both
+            await self._store_inbound(message)
+        # Shielded so one caller giving up doesn't cancel the run for the
+        # others; once the last one gives up, the agents' LLM calls are
+        # abandoned instead of running on for a reply no one will read
+        self._inflight_waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._inflight_waiters[key] == 1:
+                # Forget it now so a retry starts a fresh run instead of
+                # joining one that is being cancelled
+                if self._inflight.get(key) is task:
+                    del self._inflight[key]
+                task.cancel()
+            raise
+        finally:
+            self._inflight_waiters[key] -= 1
+            if not self._inflight_waiters[key]:
+                del self._inflight_waiters[key]
+
+    @staticmethod
+    def _inflight_key(message: InboundMessage, streaming: bool) -> tuple:
+        """Identity of a message for duplicate detection."""
+        return (
+            message.chat_id,
+            message.sender_id,
+            message.message_type,
+            message.content,
+            tuple(message.mentions),
+            tuple(message.media),
+            streaming,
+        )
+
+    async def _process_message(
+        self,
+        message: InboundMessage,
+        on_response: Callable[[OutboundMessage], Awaitable[None]] | None = None,
+    ) -> list[OutboundMessage]:
+        """Route and process a message (see process_message)."""
+        # With a single agent every route but an @here broadcast (which
+        # formats a standup report) ends at that agent, so skip routing
+        if len(self.agents) == 1 and "@here" not in message.content:
+            name = next(iter(self.agents))
+            logger.debug("Single-agent fast path to {}", name)
+            await self._store_inbound(message)
+            response = await self._agent_process(name, message)
+            return [response] if response else []
+
         # Get active agents for this channel
         active_names = await self.get_active_agents(message.chat_id)
         if not active_names:
@@ -309,40 +463,21 @@ class SotionOrchestrator:
             # Inject standup prompt if this is a standup request
             if is_standup:
                 logger.info("Processing standup request")
-                standup_prompt = """
-This is a standup request. Please provide a brief update on your recent work:
-
-1. **What you've worked on recently** (last 24-48 hours)
-2. **Current tasks** (what you're doing now)
-3. **Blockers or questions** (if any)
-
-Use the `log_update` tool to record your update, then respond with a summary.
-Format your response as:
-
-**[Your Name] - [Your Role]**
-- Recent: [brief summary]
-- Current: [current task]
-- Blockers: [any issues or "None"]
-"""
-                # Create modified message with standup prompt
-                standup_message = InboundMessage(
-                    content=f"{standup_prompt}\n\nOriginal request: {message.content}",
-                    channel=message.channel,
-                    chat_id=message.chat_id,
-                    sender_name=message.sender_name,
-                    mentions=message.mentions,
+                message = replace(
+                    message,
+                    content=f"{STANDUP_PROMPT}\n\nOriginal request: {message.content}",
                 )
-                message = standup_message
 
-            # All target agents respond concurrently
-            responses = await asyncio.gather(
-                *[
-                    self._agent_process(name, message)
+            # All target agents respond concurrently; regular broadcast replies
+            # stream out as they finish, standup ones wait for the report
+            stream_to = None if is_standup else on_response
+            async with asyncio.TaskGroup() as tg:
+                tasks = [
+                    tg.create_task(self._bounded_agent_process(name, message, stream_to))
                     for name in target_names
                     if name in self.agents
-                ],
-                return_exceptions=True,
-            )
+                ]
+            responses = [t.result() for t in tasks]
 
             # Aggregate standup responses into single report
             if is_standup:
@@ -359,14 +494,8 @@ Format your response as:
                     )
                 ]
 
-            # Regular broadcast: return individual responses
-            results = []
-            for r in responses:
-                if isinstance(r, Exception):
-                    logger.error(f"Agent error during broadcast: {r}")
-                elif r:
-                    results.append(r)
-            return results
+            # Regular broadcast: return the replies not already streamed
+            return [r for r in responses if r]
         else:
             # Single agent (or coordinator) processes
             name = target_names[0]
@@ -375,6 +504,31 @@ Format your response as:
             response = await self._agent_process(name, message)
             return [response] if response else []
 
+    async def _bounded_agent_process(
+        self,
+        agent_name: str,
+        message: InboundMessage,
+        on_response: Callable[[OutboundMessage], Awaitable[None]] | None = None,
+    ) -> OutboundMessage | None:
+        """
+        Run _agent_process under the concurrency cap; errors become None.
+
+        With on_response, the reply is handed to it instead of returned.
+        """
+        async with self._agent_semaphore:
+            try:
+                response = await self._agent_process(agent_name, message)
+            except Exception as e:
+                logger.error(f"Agent error during broadcast: {e}")
+                return None
+        if response and on_response:
+            try:
+                await on_response(response)
+            except Exception as e:
+                logger.error(f"Failed to deliver {agent_name}'s reply: {e}")
+            return None
+        return response
+
     async def _agent_process(
         self, agent_name: str, message: InboundMessage
     ) -> OutboundMessage | None:
@@ -387,38 +541,36 @@ Format your response as:
         if not config:
             return None
 
-        # Update context on Sotion tools that need it
-        # LogUpdateTool: set_context(agent_id, channel_id)
-        log_tool = loop.tools.get("log_update")
-        if log_tool and hasattr(log_tool, "set_context"):
-            log_tool.set_context(config.id, message.chat_id)
-
-        # CreateDocTool: set_context(channel_id, agent_id)
-        create_doc_tool = loop.tools.get("create_doc")
-        if create_doc_tool and hasattr(create_doc_tool, "set_context"):
-            create_doc_tool.set_context(message.chat_id, config.id)
-
-        # EditDocTool: set_context(agent_id)
-        edit_doc_tool = loop.tools.get("edit_doc")
-        if edit_doc_tool and hasattr(edit_doc_tool, "set_context"):
-            edit_doc_tool.set_context(config.id)
-
-        # QueryDocsTool: set_context(channel_id)
-        query_docs_tool = loop.tools.get("query_docs")
-        if query_docs_tool and hasattr(query_docs_tool, "set_context"):
-            query_docs_tool.set_context(message.chat_id)
-
-        # CreateTaskTool: set_context(channel_id)
-        create_task_tool = loop.tools.get("create_task")
-        if create_task_tool and hasattr(create_task_tool, "set_context"):
-            create_task_tool.set_context(message.chat_id)
+        # Answer recurring plain-chat questions without another LLM round trip
+        cache = self.response_cache
+        if cache and not ResponseCache.cacheable(message):
+            cache = None
+        if cache:
+            cached = await cache.lookup(message.chat_id, agent_name, message.content)
+            if cached:
+                outbound = OutboundMessage(
+                    channel=message.channel,
+                    chat_id=message.chat_id,
+                    content=cached.content,
+                    sender_agent_id=config.id,
+                    sender_agent_name=agent_name,
+                    sender_agent_role=config.role,
+                )
+                await self._store_outbound(outbound)
+                return outbound
 
+        # Sotion tools know their agent from registration and read the
+        # channel from this context variable while the turn runs
+        token = current_channel_id.set(message.chat_id)
         try:
             response_text = await loop.process_direct(
                 content=message.content,
                 session_key=f"{message.chat_id}:{agent_name}",
                 channel=message.channel,
                 chat_id=message.chat_id,
+                # A failed LLM call becomes an error reply below, so it is
+                # neither cached nor credited to the agent
+                raise_on_error=True,
             )
 
             outbound = OutboundMessage(
@@ -432,6 +584,8 @@ Format your response as:
 
             # Store the outbound message
             await self._store_outbound(outbound)
+            if cache:
+                await cache.store(message.chat_id, agent_name, message.content, outbound)
 
             return outbound
 
@@ -443,46 +597,32 @@ Format your response as:
                 content=f"[{agent_name}] Error: {str(e)}",
                 sender_agent_name=agent_name,
             )
+        finally:
+            current_channel_id.reset(token)
 
     async def _format_standup_report(
-        self, responses: list, channel_id: str
+        self, responses: list[OutboundMessage | None], channel_id: str
     ) -> str:
         """Format agent responses into a standup report."""
         report_lines = [
-            "## 📊 Team Standup Report\n",
-            f"*Generated at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n",
+            _STANDUP_REPORT_HEADER,
+            f"*Generated at {datetime.now().isoformat(' ', 'seconds')}*\n",
         ]
 
-        # Get recent log_update entries
+        # Get recent log_update entries, grouped by agent id in Postgres
         updates_by_agent = {}
         if self.db:
             try:
-                recent_updates = await self.db.get_recent_agent_updates(
+                updates_by_agent = await self.db.get_recent_updates_by_agent(
                     channel_id=channel_id,
                     hours=48,  # Last 48 hours
+                    per_agent=3,
                 )
-
-                # Group by agent
-                for update in recent_updates:
-                    agent_name = None
-                    # Find agent name by ID
-                    for name, config in self.agent_configs.items():
-                        if str(config.id) == str(update.agent_id):
-                            agent_name = name
-                            break
-
-                    if agent_name:
-                        if agent_name not in updates_by_agent:
-                            updates_by_agent[agent_name] = []
-                        updates_by_agent[agent_name].append(update)
             except Exception as e:
                 logger.error(f"Failed to get recent updates: {e}")
 
         # Process each response
         for response in responses:
-            if isinstance(response, Exception):
-                continue
-
             if isinstance(response, OutboundMessage):
                 agent_name = response.sender_agent_name
                 agent_config = self.agent_configs.get(agent_name)
@@ -492,16 +632,17 @@ Format your response as:
 
                 report_lines.append(f"\n### {agent_name} ({agent_config.role})")
 
-                # Include logged updates
-                if updates_by_agent.get(agent_name):
+                # Include logged updates (newest 3)
+                updates = updates_by_agent.get(agent_config.id)
+                if updates:
                     report_lines.append("\n**Recent Updates:**")
-                    for update in updates_by_agent[agent_name][:3]:  # Last 3
+                    for update in updates:
                         report_lines.append(f"- {update.summary}")
 
                 # Include agent's standup response
                 report_lines.append(f"\n{response.content}\n")
 
-        report_lines.append("\n---\n*Use `log_update` tool to record your progress*")
+        report_lines.append(_STANDUP_REPORT_FOOTER)
 
         return "\n".join(report_lines)
 
@@ -516,7 +657,7 @@ Format your response as:
                 message_type=message.message_type,
                 mentions=message.mentions,
             )
-            await self.db.create_message(msg)
+            self._enqueue_write(msg)
         except Exception as e:
             logger.warning(f"Failed to store inbound message: {e}")
 
@@ -531,10 +672,36 @@ Format your response as:
                 content=message.content,
                 message_type=message.message_type,
             )
-            await self.db.create_message(msg)
+            self._enqueue_write(msg)
         except Exception as e:
             logger.warning(f"Failed to store outbound message: {e}")
 
+    def _enqueue_write(self, msg: Message) -> None:
+        try:
+            self._write_queue.put_nowait(msg)
+        except asyncio.QueueFull:
+            logger.warning(f"Message write backlog full, dropping message {msg.id}")
+            return
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = asyncio.create_task(self._flush_writes())
+
+    async def _flush_writes(self) -> None:
+        while True:
+            batch = [await self._write_queue.get()]
+            await asyncio.sleep(WRITE_INTERVAL)
+            # Whatever queued up meanwhile goes out together
+            while len(batch) < WRITE_BATCH_SIZE and not self._write_queue.empty():
+                batch.append(self._write_queue.get_nowait())
+            await self._write_messages(batch)
+            for _ in batch:
+                self._write_queue.task_done()
+
+    async def _write_messages(self, batch: list[Message]) -> None:
+        try:
+            await self.db.create_messages(batch)
+        except Exception as e:
+            logger.warning(f"Failed to store {len(batch)} messages: {e}")
+
     async def run(self) -> None:
         """Run the orchestrator, consuming from the bus."""
         self._running = True
@@ -544,17 +711,35 @@ Format your response as:
         )
 
         while self._running:
-            try:
-                msg = await asyncio.wait_for(
-                    self.bus.consume_inbound(), timeout=1.0
+            msgs = await self.bus.consume_inbound_batch(INBOUND_BATCH_SIZE)
+            await self._prefetch_members(msgs)
+            # One task per message so a slow turn doesn't hold up other channels
+            for msg in msgs:
+                task = asyncio.create_task(self._handle(msg))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _prefetch_members(self, msgs: list[InboundMessage]) -> None:
+        """Warm the member cache for a batch's channels with one query."""
+        channel_ids = list({m.chat_id for m in msgs})
+        if not self.db or len(channel_ids) < 2:
+            return
+        try:
+            await self.db.get_channel_members_bulk(channel_ids)
+        except Exception as e:
+            logger.warning(f"Failed to prefetch channel members: {e}")
+
+    async def _handle(self, msg: InboundMessage) -> None:
+        """Process a bus message and publish its responses, in order per channel."""
+        try:
+            async with self._channel_locks[msg.chat_id]:
+                responses = await self.process_message(
+                    msg, on_response=self.bus.publish_outbound
                 )
-                responses = await self.process_message(msg)
                 for r in responses:
                     await self.bus.publish_outbound(r)
-            except asyncio.TimeoutError:
-                continue
-            except Exception as e:
-                logger.error(f"Orchestrator error: {e}")
+        except Exception as e:
+            logger.error(f"Orchestrator error: {e}")
 
     def stop(self) -> None:
         """Stop the orchestrator."""
@@ -562,3 +747,22 @@ Format your response as:
         for name, loop in self.agents.items():
             loop.stop()
         logger.info("Orchestrator stopped")
+
+    async def close(self) -> None:
+        """Finish in-flight bus messages and persist queued ones, then stop."""
+        if self._tasks:
+            _, pending = await asyncio.wait(set(self._tasks), timeout=SHUTDOWN_TIMEOUT)
+            for task in pending:
+                task.cancel()
+            if pending:
+                logger.warning(f"Cancelled {len(pending)} messages still processing at shutdown")
+                await asyncio.gather(*pending, return_exceptions=True)
+        task, self._writer_task = self._writer_task, None
+        if task:
+            if not task.done():
+                await self._write_queue.join()
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
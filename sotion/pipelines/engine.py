@@ -1,12 +1,16 @@
 """Pipeline execution engine."""
 
 import asyncio
+import hashlib
+import time
 import uuid
+from collections import OrderedDict, defaultdict
 from typing import Any, TYPE_CHECKING
 
 from loguru import logger
 
-from sotion.pipelines.schema import PipelineDefinition, PipelineRun
+from sotion.bus.events import InboundMessage
+from sotion.pipelines.schema import PipelineDefinition, PipelineRun, PipelineStep
 
 if TYPE_CHECKING:
     from sotion.orchestrator import SotionOrchestrator
@@ -20,9 +24,18 @@ class PipelineEngine:
     context is passed between steps, and retries are supported.
     """
 
+    # Replies kept for `cacheable` steps: dropped after the TTL, least
+    # recently used evicted first when full
+    RESPONSE_CACHE_TTL = 3600.0
+    RESPONSE_CACHE_SIZE = 1024
+
     def __init__(self, orchestrator: "SotionOrchestrator"):
         self.orchestrator = orchestrator
         self.active_runs: dict[str, PipelineRun] = {}
+        self._response_cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        # Steps that resolve to the same agent share its AgentLoop and session,
+        # so concurrent steps (same stage, or parallel runs) take turns on it
+        self._agent_locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
 
     async def start_pipeline(
         self,
@@ -41,74 +54,56 @@ class PipelineEngine:
 
         logger.info(f"Starting pipeline '{definition.name}' (run: {run.id})")
 
-        # Execute steps sequentially
-        for i, step in enumerate(definition.steps):
-            run.current_step = i
-            logger.info(f"Pipeline step {i+1}/{len(definition.steps)}: {step.name}")
-
-            # Find an agent with the matching role
-            agent_name = self._find_agent_for_role(step.agent_role)
-            if not agent_name:
-                run.status = "failed"
-                run.step_results.append({
+        # A step no agent can take would fail the run anyway; fail it before
+        # earlier steps spend LLM calls
+        unstaffed = [
+            step for step in definition.steps
+            if not self._find_agent_for_role(step.agent_role)
+        ]
+        if unstaffed:
+            run.status = "failed"
+            run.step_results = [
+                {
                     "step": step.name,
                     "status": "failed",
                     "error": f"No agent with role '{step.agent_role}' available",
-                })
-                logger.error(f"No agent for role '{step.agent_role}'")
-                break
-
-            # Build the prompt with context
-            prompt = step.prompt.format(**run.context)
-
-            # Execute with retry
-            result = None
-            for attempt in range(step.retry_count + 1):
-                try:
-                    from sotion.bus.events import InboundMessage
-
-                    msg = InboundMessage(
-                        channel="pipeline",
-                        sender_id="pipeline",
-                        chat_id=channel_id,
-                        content=f"[Pipeline: {definition.name}, Step: {step.name}]\n\n{prompt}",
-                        message_type="chat",
-                        mentions=[agent_name],
-                    )
-                    responses = await asyncio.wait_for(
-                        self.orchestrator.process_message(msg),
-                        timeout=step.timeout_seconds,
-                    )
-                    if responses:
-                        result = responses[0].content
-                        break
-                except asyncio.TimeoutError:
-                    logger.warning(
-                        f"Step '{step.name}' timed out (attempt {attempt+1})"
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Step '{step.name}' failed (attempt {attempt+1}): {e}"
-                    )
-
-            step_result = {
-                "step": step.name,
-                "agent": agent_name,
-                "status": "completed" if result else "failed",
-                "output": result,
-            }
-            run.step_results.append(step_result)
-
-            if not result:
-                run.status = "failed"
+                }
+                for step in unstaffed
+            ]
+            logger.error(
+                f"Pipeline '{definition.name}' needs unavailable roles: "
+                f"{sorted({step.agent_role for step in unstaffed})}"
+            )
+            return run
+
+        # Execute stages in order; the steps within a stage run concurrently
+        # and only see the outputs of earlier stages
+        all_ok = True
+        for stage in self._group_stages(definition.steps):
+            run.current_step = stage[0][0]
+            if len(stage) == 1:
+                i, step = stage[0]
+                results = [await self._run_step(definition, run, i, step)]
+            else:
+                async with asyncio.TaskGroup() as tg:
+                    tasks = [
+                        tg.create_task(self._run_step(definition, run, i, step))
+                        for i, step in stage
+                    ]
+                results = [t.result() for t in tasks]
+            run.step_results.extend(results)
+
+            if any(r["status"] == "failed" for r in results):
+                all_ok = False
                 break
 
-            # Pass result to context for next step
-            run.context[f"step_{i}_output"] = result
-            run.context["last_output"] = result
+            # Pass results to context for the next stage
+            for (i, step), step_result in zip(stage, results):
+                run.context[f"step_{i}_output"] = step_result["output"]
+                run.context[f"step_{step.name}_output"] = step_result["output"]
+            run.context["last_output"] = results[-1]["output"]
 
-        else:
-            run.status = "completed"
+        run.status = "completed" if all_ok else "failed"
 
         logger.info(
             f"Pipeline '{definition.name}' {run.status} "
@@ -116,12 +111,105 @@ class PipelineEngine:
         )
         return run
 
+    @staticmethod
+    def _group_stages(steps: list[PipelineStep]) -> list[list[tuple[int, PipelineStep]]]:
+        """Split steps into stages: runs of consecutive steps sharing a stage number."""
+        stages: list[list[tuple[int, PipelineStep]]] = []
+        for i, step in enumerate(steps):
+            if stages and step.stage is not None and stages[-1][-1][1].stage == step.stage:
+                stages[-1].append((i, step))
+            else:
+                stages.append([(i, step)])
+        return stages
+
+    async def _run_step(
+        self, definition: PipelineDefinition, run: PipelineRun, i: int, step: PipelineStep
+    ) -> dict[str, Any]:
+        """Run one step with retries and return its step result."""
+        logger.info(f"Pipeline step {i+1}/{len(definition.steps)}: {step.name}")
+
+        # Find an agent with the matching role
+        agent_name = self._find_agent_for_role(step.agent_role)
+        if not agent_name:
+            logger.error(f"No agent for role '{step.agent_role}'")
+            return {
+                "step": step.name,
+                "status": "failed",
+                "error": f"No agent with role '{step.agent_role}' available",
+            }
+
+        # Build the prompt with context
+        prompt = step.render(run.context)
+
+        # Fields shared by every attempt; each attempt still gets its own message
+        base = {
+            "channel": "pipeline",
+            "sender_id": "pipeline",
+            "chat_id": run.channel_id,
+            "content": f"[Pipeline: {definition.name}, Step: {step.name}]\n\n{prompt}",
+            "message_type": "chat",
+        }
+
+        cache_key = None
+        if step.cacheable:
+            agent = self.orchestrator.agent_configs.get(agent_name)
+            model = agent.model if agent else ""
+            cache_key = hashlib.sha256(
+                f"{model}:{agent_name}:{base['content']}".encode()
+            ).hexdigest()
+            cached = self._response_cache.get(cache_key)
+            if cached and time.monotonic() - cached[0] < self.RESPONSE_CACHE_TTL:
+                self._response_cache.move_to_end(cache_key)
+                logger.info(f"Step '{step.name}' answered from cache")
+                return {
+                    "step": step.name,
+                    "agent": agent_name,
+                    "status": "completed",
+                    "output": cached[1],
+                }
+            self._response_cache.pop(cache_key, None)
+
+        # Execute with retry
+        result = None
+        # Only the agent's own reply carries its id; error replies don't
+        from_agent = False
+        for attempt in range(step.retry_count + 1):
+            try:
+                msg = InboundMessage(**base, mentions=[agent_name])
+                async with self._agent_locks[agent_name]:
+                    responses = await asyncio.wait_for(
+                        self.orchestrator.process_message(msg),
+                        timeout=step.timeout_seconds,
+                    )
+                if responses:
+                    result = responses[0].content
+                    from_agent = responses[0].sender_agent_id is not None
+                    break
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"Step '{step.name}' timed out (attempt {attempt+1})"
+                )
+            except Exception as e:
+                logger.error(
+                    f"Step '{step.name}' failed (attempt {attempt+1}): {e}"
+                )
+
+        if cache_key and result and from_agent:
+            self._response_cache[cache_key] = (time.monotonic(), result)
+            if len(self._response_cache) > self.RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+
+        return {
+            "step": step.name,
+            "agent": agent_name,
+            "status": "completed" if result else "failed",
+            "output": result,
+        }
+
     def _find_agent_for_role(self, role: str) -> str | None:
         """Find an agent with the given role."""
-        for name, config in self.orchestrator.agent_configs.items():
-            if config.role == role and name in self.orchestrator.agents:
-                return name
-        return None
+        names = self.orchestrator.agents_by_role.get(role)
+        return names[0] if names else None
 
     def get_run(self, run_id: str) -> PipelineRun | None:
         return self.active_runs.get(run_id)
@@ -1,8 +1,13 @@
 """Pipeline YAML schema validation."""
 
+import re
+from dataclasses import dataclass, field
+from string import Formatter
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+_FORMATTER = Formatter()
 
 
 class PipelineStep(BaseModel):
@@ -13,6 +18,34 @@ class PipelineStep(BaseModel):
     timeout_seconds: int = 300
     retry_count: int = 1
     requires_approval: bool = False  # Human must approve before proceeding
+    stage: int | None = None  # Consecutive steps with the same stage run concurrently
+    cacheable: bool = False  # Reuse the reply when the same agent got the same prompt before
+
+    # Parsed once at load; render() walks this instead of re-parsing the prompt
+    _template: list[tuple[str, str | None, str | None, str | None]] = PrivateAttr()
+    _fields: frozenset[str] = PrivateAttr()
+
+    def model_post_init(self, __context: Any) -> None:
+        self._template = list(_FORMATTER.parse(self.prompt))
+        # Root names only, so "{plan.title}" or "{items[0]}" still pull "plan"/"items"
+        self._fields = frozenset(
+            re.split(r"[.\[]", f, maxsplit=1)[0] for _, f, _, _ in self._template if f
+        )
+
+    def render(self, ctx: dict[str, Any]) -> str:
+        """Fill the prompt from `ctx`; same result as `prompt.format(**ctx)`."""
+        kwargs = {k: ctx[k] for k in self._fields}
+        parts = []
+        for literal, name, spec, conversion in self._template:
+            parts.append(literal)
+            if name is None:
+                continue
+            value = _FORMATTER.get_field(name, (), kwargs)[0]
+            value = _FORMATTER.convert_field(value, conversion)
+            if spec and "{" in spec:  # nested "{x:{width}}" spec, rare enough to parse here
+                spec = _FORMATTER.vformat(spec, (), ctx)
+            parts.append(format(value, spec or ""))
+        return "".join(parts)
 
 
 class PipelineDefinition(BaseModel):
@@ -23,15 +56,16 @@ class PipelineDefinition(BaseModel):
     context: dict[str, Any] = Field(default_factory=dict)
 
 
-class PipelineRun(BaseModel):
-    """A running instance of a pipeline."""
+@dataclass(slots=True)
+class PipelineRun:
+    """A running instance of a pipeline (engine state, mutated every step, so not validated)."""
     id: str
     pipeline_name: str
     channel_id: str
     current_step: int = 0
     status: str = "running"  # 'running', 'paused', 'completed', 'failed'
-    context: dict[str, Any] = Field(default_factory=dict)
-    step_results: list[dict[str, Any]] = Field(default_factory=list)
+    context: dict[str, Any] = field(default_factory=dict)
+    step_results: list[dict[str, Any]] = field(default_factory=list)
 
 
 def validate_pipeline_yaml(data: dict[str, Any]) -> PipelineDefinition:
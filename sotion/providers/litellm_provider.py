@@ -1,5 +1,6 @@
 """LiteLLM provider implementation for multi-provider support."""
 
+import asyncio
 import json
 import os
 from typing import Any
@@ -27,10 +28,14 @@ class LiteLLMProvider(LLMProvider):
         default_model: str = "anthropic/claude-opus-4-5",
         extra_headers: dict[str, str] | None = None,
         provider_name: str | None = None,
+        max_concurrency: int | None = None,
     ):
         super().__init__(api_key, api_base)
         self.default_model = default_model
         self.extra_headers = extra_headers or {}
+        # Shared by every agent using this provider, so a broadcast fan-out
+        # queues here instead of tripping the provider's rate limits
+        self._semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
 
         # Detect gateway / local deployment.
         # provider_name (from config key) is the primary signal;
@@ -50,9 +55,10 @@ class LiteLLMProvider(LLMProvider):
         api_key = config.get_api_key(default_model)
         api_base = config.get_api_base(default_model)
 
-        # Get extra headers from provider config if available
+        # Get extra headers and the concurrency limit from provider config if available
         provider_config = config.get_provider(default_model)
         extra_headers = provider_config.extra_headers if provider_config else None
+        max_concurrency = provider_config.max_concurrency if provider_config else None
 
         return cls(
             api_key=api_key,
@@ -60,6 +66,7 @@ class LiteLLMProvider(LLMProvider):
             default_model=default_model,
             extra_headers=extra_headers,
             provider_name=provider_name,
+            max_concurrency=max_concurrency,
         )
         
         # Configure environment variables
@@ -124,6 +131,28 @@ class LiteLLMProvider(LLMProvider):
                     kwargs.update(overrides)
                     return
     
+    def _apply_prompt_caching(
+        self, model: str, messages: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Mark the leading system prompt as a cache breakpoint where supported."""
+        spec = self._gateway or find_by_model(model)
+        if not spec or not spec.supports_prompt_caching:
+            return messages
+        first = messages[0] if messages else None
+        if not first or first.get("role") != "system" or not isinstance(first.get("content"), str):
+            return messages
+        # The context builder keeps this message byte-stable across turns, so
+        # the provider can reuse it; per-turn context follows in its own message
+        cached = {
+            "role": "system",
+            "content": [{
+                "type": "text",
+                "text": first["content"],
+                "cache_control": {"type": "ephemeral"},
+            }],
+        }
+        return [cached, *messages[1:]]
+
     async def chat(
         self,
         messages: list[dict[str, Any]],
@@ -149,7 +178,7 @@ class LiteLLMProvider(LLMProvider):
         
         kwargs: dict[str, Any] = {
             "model": model,
-            "messages": messages,
+            "messages": self._apply_prompt_caching(model, messages),
             "max_tokens": max_tokens,
             "temperature": temperature,
         }
@@ -174,7 +203,11 @@ class LiteLLMProvider(LLMProvider):
             kwargs["tool_choice"] = "auto"
         
         try:
-            response = await acompletion(**kwargs)
+            if self._semaphore:
+                async with self._semaphore:
+                    response = await acompletion(**kwargs)
+            else:
+                response = await acompletion(**kwargs)
             return self._parse_response(response)
         except Exception as e:
             # Return error as content for graceful handling